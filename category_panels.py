@@ -5,11 +5,253 @@ Category Panels Module
 Handles creation and management of category panels in the GUI.
 """
 
+from collections import deque
+from functools import partial
+
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton, QTextEdit,
-    QLabel, QGroupBox, QLineEdit, QCheckBox, QAbstractItemView, QListWidgetItem
+    QWidget, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QPlainTextEdit,
+    QLabel, QGroupBox, QLineEdit, QAbstractItemView
+)
+from PySide6.QtCore import (
+    Qt, Signal, QObject, QAbstractListModel, QModelIndex, QTimer, QUrl, QThreadPool
+)
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+
+from data_manager import (
+    fetch_model_metadata, fallback_model_name, civitai_version_api_url, civitai_version_name,
+    parse_json
 )
-from PySide6.QtCore import Qt, Signal, QObject
+
+
+class MetadataFetcher(QObject):
+    """Fetches model names on the Qt event loop
+    
+    Only CivitAI download links need an API request; those are queued and
+    sent through one QNetworkAccessManager, with at most
+    max_parallel_downloads requests in flight. Every other URL is named
+    straight from the metadata cache or the URL itself.
+    """
+    
+    # Signals
+    metadata_ready = Signal(str, str, str)  # category, url, name
+    
+    def __init__(self, data_manager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self._nam = QNetworkAccessManager(self)
+        self._queue = deque()
+        self._pending = set()  # (category, url) pairs queued or in flight
+        self._replies = set()
+    
+    def fetch(self, category, url):
+        """Fetch the name for a URL and emit metadata_ready when known"""
+        if (category, url) in self._pending:
+            return
+        
+        api_url = civitai_version_api_url(url)
+        name = self.data_manager.metadata_cache.get(url)
+        if name or api_url is None:
+            name = name or fetch_model_metadata(url)
+            if name:
+                self.metadata_ready.emit(category, url, name)
+            return
+        
+        self._pending.add((category, url))
+        self._queue.append((category, url, api_url))
+        self._start_next()
+    
+    def _start_next(self):
+        """Send queued requests until the in-flight limit is reached"""
+        limit = max(1, self.data_manager.data.get('max_parallel_downloads', 4))
+        while self._queue and len(self._replies) < limit:
+            category, url, api_url = self._queue.popleft()
+            request = QNetworkRequest(QUrl(api_url))
+            request.setTransferTimeout(10000)
+            for header, value in self.data_manager.metadata_cache.conditional_headers(url).items():
+                request.setRawHeader(header.encode(), value.encode())
+            reply = self._nam.get(request)
+            reply.finished.connect(partial(self._on_reply_finished, reply, category, url))
+            self._replies.add(reply)
+    
+    def _on_reply_finished(self, reply, category, url):
+        """Turn a finished API reply into a model name"""
+        self._replies.discard(reply)
+        self._pending.discard((category, url))
+        reply.deleteLater()
+        
+        cache = self.data_manager.metadata_cache
+        error = reply.error()
+        if error != QNetworkReply.OperationCanceledError:
+            name = None
+            status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+            if error == QNetworkReply.NoError and status == 304:
+                # Unchanged since the cached copy, no body to parse
+                name = cache.revalidate(url)
+            elif error == QNetworkReply.NoError:
+                try:
+                    name = civitai_version_name(parse_json(bytes(reply.readAll())))
+                    cache.put(
+                        url, name,
+                        bytes(reply.rawHeader('ETag')).decode() or None,
+                        bytes(reply.rawHeader('Last-Modified')).decode() or None
+                    )
+                except (ValueError, AttributeError) as e:
+                    print(f"Error fetching metadata for {url}: {e}")
+            else:
+                print(f"Error fetching metadata for {url}: {reply.errorString()}")
+            
+            name = name or fallback_model_name(url)
+            if name:
+                self.metadata_ready.emit(category, url, name)
+        
+        self._start_next()
+    
+    def abort(self):
+        """Drop queued fetches and abort the ones in flight"""
+        self._queue.clear()
+        for reply in list(self._replies):
+            reply.abort()
+
+
+class CategoryModel(QAbstractListModel):
+    """List model holding the items of a single category
+    
+    Rows are stored as (display_name, checked, url) tuples so the view only
+    has to paint the visible rows instead of owning one widget per item.
+    The view is shown PAGE_SIZE rows at a time and fetches more as it
+    scrolls, so resetting a large category stays cheap.
+    """
+    
+    PAGE_SIZE = 200
+    
+    # Signals
+    check_toggled = Signal(str, str, bool)  # category, url, checked
+    
+    def __init__(self, key, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self._rows = []
+        self._loaded = 0  # rows exposed to views so far
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._loaded
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._rows)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self._rows) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        display_name, checked, url = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return display_name
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if checked else Qt.Unchecked
+        if role in (Qt.ToolTipRole, Qt.UserRole):
+            return url
+        return None
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+        
+        display_name, _, url = self._rows[index.row()]
+        checked = Qt.CheckState(value) == Qt.Checked
+        self._rows[index.row()] = (display_name, checked, url)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.check_toggled.emit(self.key, url, checked)
+        return True
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsUserCheckable | Qt.ItemIsEnabled | Qt.ItemIsSelectable
+    
+    def set_rows(self, rows):
+        """Replace all rows in a single model reset"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._loaded = min(len(self._rows), self.PAGE_SIZE)
+        self.endResetModel()
+    
+    def append_row(self, display_name, checked, url):
+        """Append a single row"""
+        self.append_rows([(display_name, checked, url)])
+    
+    def append_rows(self, rows):
+        """Append (display name, checked, url) rows with a single insert"""
+        first = len(self._rows)
+        if not rows or self._loaded < first:
+            # Shown once the view fetches up to them
+            self._rows.extend(rows)
+            return
+        # Expose at most a page now; the view fetches the rest as it scrolls
+        count = min(len(rows), self.PAGE_SIZE)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self._rows.extend(rows)
+        self._loaded += count
+        self.endInsertRows()
+    
+    def remove_row(self, row):
+        """Remove a single row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self._loaded -= 1
+        self.endRemoveRows()
+    
+    def set_all_checked(self, checked):
+        """Set the checked state of every row"""
+        self._rows = [(display_name, checked, url) for display_name, _, url in self._rows]
+        self._emit_check_states_changed()
+    
+    def set_checked_states(self, states):
+        """Set the checked state of rows from a {url: checked} dict"""
+        self._rows = [(display_name, states.get(url, checked), url)
+                      for display_name, checked, url in self._rows]
+        self._emit_check_states_changed()
+    
+    def _emit_check_states_changed(self):
+        """Notify views that every row's check state may have changed"""
+        if self._loaded:
+            self.dataChanged.emit(self.index(0), self.index(self._loaded - 1), [Qt.CheckStateRole])
+    
+    def rows(self):
+        """Get all rows as (display_name, checked, url) tuples"""
+        return list(self._rows)
+    
+    def url_at(self, row):
+        """Get the URL stored in a row"""
+        return self._rows[row][2]
+    
+    def update_display_names(self, names):
+        """Update the display name of every row whose URL is in names"""
+        first = last = None
+        for row, (_, checked, url) in enumerate(self._rows):
+            name = names.get(url)
+            if name:
+                self._rows[row] = (name, checked, url)
+                first = row if first is None else first
+                last = row
+        
+        # Rows not fetched yet are read fresh when they are
+        if first is not None and first < self._loaded:
+            last = min(last, self._loaded - 1)
+            self.dataChanged.emit(self.index(first), self.index(last), [Qt.DisplayRole])
 
 
 class CategoryPanelManager(QObject):
@@ -24,11 +266,54 @@ class CategoryPanelManager(QObject):
         self.stacked_widget = stacked_widget
         self.data_manager = data_manager
         self.panels = {}
-        self.list_widgets = {}
+        self.list_views = {}
+        self.models = {}
         self.input_widgets = {}
+        self._factories = {}  # key -> panel factory, until the panel is built
+        # key -> stacked widget index of a built panel; panels are only ever
+        # appended, so recorded indices stay valid
+        self._panel_indices = {}
+        self._shown_revs = {}  # key -> data revision the model last mirrored
+        
+        # Refresh lists for data changed elsewhere once control returns
+        # to the event loop, however many changes were made meanwhile
+        self._stale_keys = set()
+        self._stale_timer = QTimer(self)
+        self._stale_timer.setSingleShot(True)
+        self._stale_timer.setInterval(0)
+        self._stale_timer.timeout.connect(self._refresh_stale)
+        data_manager.add_listener(self._on_data_changed_for)
+        
+        # Fetched names arrive one by one; apply them in batches
+        self._metadata_fetcher = MetadataFetcher(data_manager, self)
+        self._metadata_fetcher.metadata_ready.connect(self._queue_fetched_name)
+        self._fetched_names = {}  # key -> {url: name}
+        self._names_timer = QTimer(self)
+        self._names_timer.setSingleShot(True)
+        self._names_timer.setInterval(50)
+        self._names_timer.timeout.connect(self._apply_queued_names)
+        
+        # Debounce database writes so bursts of edits hit the disk once
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(300)
+        self._save_timer.timeout.connect(self._save_in_background)
+        # Serialization and the write itself run here, one save at a time
+        self._save_pool = QThreadPool(self)
+        self._save_pool.setMaxThreadCount(1)
+        
+        # Only apply the parallel downloads value once the user stops typing
+        self._parallel_timer = QTimer(self)
+        self._parallel_timer.setSingleShot(True)
+        self._parallel_timer.setInterval(400)
+        self._parallel_timer.timeout.connect(self._apply_parallel_downloads)
     
-    def create_all_panels(self):
-        """Create all category panels"""
+    def register_all_panels(self):
+        """Create the settings panel and register factories for all category panels
+        
+        Category panels are built and added to the stacked widget by
+        ensure_built the first time they are shown.
+        """
         # Settings panel
         self.create_settings_panel()
         
@@ -52,7 +337,20 @@ class CategoryPanelManager(QObject):
         ]
         
         for key, name, instructions in category_configs:
-            self.create_category_panel(key, name, instructions)
+            self._factories[key] = partial(self.create_category_panel, key, name, instructions)
+    
+    def ensure_built(self, key):
+        """Get the stacked widget index of a panel, building the panel on first use
+        
+        Returns -1 for an unknown key.
+        """
+        if key not in self.panels:
+            factory = self._factories.pop(key, None)
+            if factory is None:
+                return -1
+            self._panel_indices[key] = self.stacked_widget.addWidget(factory())
+            self.refresh_ui_from_data_for(key)
+        return self._panel_indices[key]
     
     def create_settings_panel(self):
         """Create the settings panel"""
@@ -61,7 +359,7 @@ class CategoryPanelManager(QObject):
         
         # Title
         title = QLabel("Settings")
-        title.setStyleSheet("font-weight: bold; font-size: 16px; margin-bottom: 10px;")
+        title.setProperty("role", "title")
         layout.addWidget(title)
         
         # Parallel downloads setting
@@ -80,7 +378,7 @@ class CategoryPanelManager(QObject):
         parallel_input_layout.addWidget(self.parallel_input)
         
         parallel_help = QLabel("(Set to 1 to disable parallel downloading)")
-        parallel_help.setStyleSheet("color: gray; font-size: 10px;")
+        parallel_help.setProperty("role", "hint")
         parallel_input_layout.addWidget(parallel_help)
         parallel_input_layout.addStretch()
         
@@ -89,29 +387,29 @@ class CategoryPanelManager(QObject):
         
         layout.addStretch()
         
-        self.stacked_widget.addWidget(settings_widget)
+        self._panel_indices["settings"] = self.stacked_widget.addWidget(settings_widget)
         self.panels["settings"] = settings_widget
     
     def create_category_panel(self, key, name, instructions):
-        """Create a panel for a single category"""
+        """Create and return the panel for a single category"""
         panel_widget = QWidget()
         layout = QVBoxLayout(panel_widget)
         
         # Title
         title = QLabel(name)
-        title.setStyleSheet("font-weight: bold; font-size: 16px; margin-bottom: 5px;")
+        title.setProperty("role", "title")
         layout.addWidget(title)
         
         # Instructions
         instructions_label = QLabel(instructions)
-        instructions_label.setStyleSheet("font-size: 12px; color: #666; margin-bottom: 10px;")
+        instructions_label.setProperty("role", "instructions")
         layout.addWidget(instructions_label)
         
         # Input area
         input_layout = QHBoxLayout()
         
         # Text input for adding items
-        text_input = QTextEdit()
+        text_input = QPlainTextEdit()
         text_input.setMaximumHeight(120)
         text_input.setPlaceholderText("Paste URLs or package names here...")
         input_layout.addWidget(text_input)
@@ -119,15 +417,21 @@ class CategoryPanelManager(QObject):
         # Add button
         add_btn = QPushButton("Add")
         add_btn.setMaximumWidth(80)
-        add_btn.clicked.connect(lambda: self._add_items(key, text_input))
+        add_btn.clicked.connect(partial(self._add_items, key, text_input))
         input_layout.addWidget(add_btn)
         
         layout.addLayout(input_layout)
         
-        # List widget
-        list_widget = QListWidget()
-        list_widget.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        layout.addWidget(list_widget)
+        # List view backed by a lazily painted model
+        model = CategoryModel(key, self)
+        model.check_toggled.connect(self._update_item_checked_state)
+        list_view = QListView()
+        list_view.setModel(model)
+        list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        list_view.setUniformItemSizes(True)
+        list_view.setLayoutMode(QListView.Batched)
+        list_view.setBatchSize(50)
+        layout.addWidget(list_view)
         
         # Buttons layout
         button_layout = QHBoxLayout()
@@ -138,41 +442,69 @@ class CategoryPanelManager(QObject):
                 search_btn = QPushButton("Search Workflows")
             else:
                 search_btn = QPushButton("Search Models")
-            search_btn.clicked.connect(lambda: self.search_requested.emit(key))
+            search_btn.clicked.connect(partial(self.search_requested.emit, key))
             button_layout.addWidget(search_btn)
         
         # Remove button
         remove_btn = QPushButton("Remove Selected")
-        remove_btn.clicked.connect(lambda: self._remove_items(key, list_widget))
+        remove_btn.clicked.connect(partial(self._remove_items, key, list_view))
         button_layout.addWidget(remove_btn)
         
         # Check all button
         check_all_btn = QPushButton("Check All")
-        check_all_btn.clicked.connect(lambda: self._set_all_checked(key, list_widget, True))
+        check_all_btn.clicked.connect(partial(self._set_all_checked, key, True))
         button_layout.addWidget(check_all_btn)
         
         # Uncheck all button
         uncheck_all_btn = QPushButton("Uncheck All")
-        uncheck_all_btn.clicked.connect(lambda: self._set_all_checked(key, list_widget, False))
+        uncheck_all_btn.clicked.connect(partial(self._set_all_checked, key, False))
         button_layout.addWidget(uncheck_all_btn)
         
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
         # Store references
-        self.list_widgets[key] = list_widget
+        self.list_views[key] = list_view
+        self.models[key] = model
         self.input_widgets[key] = text_input
         self.panels[key] = panel_widget
         
-        self.stacked_widget.addWidget(panel_widget)
+        return panel_widget
+    
+    def schedule_save(self):
+        """Schedule a debounced database save"""
+        self._save_timer.start()
+    
+    def _save_in_background(self):
+        """Snapshot the data here and write it on the save thread"""
+        # Nothing to serialize; fetched names may still need to be written
+        if not self.data_manager.has_unsaved_changes():
+            self._save_pool.start(self.data_manager.metadata_cache.save)
+            return
+        snapshot = self.data_manager.snapshot()
+        self._save_pool.start(partial(
+            self.data_manager.save_snapshot, snapshot, self.data_manager.revision))
+    
+    def flush_pending_save(self):
+        """Write a pending debounced save to disk immediately"""
+        # Let queued background saves finish so they cannot land afterwards
+        self._save_pool.waitForDone()
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self.data_manager.save_database()
     
     def _update_parallel_downloads(self):
+        """Restart the parallel downloads debounce timer"""
+        self._parallel_timer.start()
+    
+    def _apply_parallel_downloads(self):
         """Update the max parallel downloads setting"""
         try:
             value = int(self.parallel_input.text())
-            if value >= 1:
+            if value >= 1 and value != self.data_manager.data.get('max_parallel_downloads'):
                 self.data_manager.update_max_parallel_downloads(value)
                 self.data_changed.emit()
+                self.schedule_save()
         except ValueError:
             # Invalid input, ignore
             pass
@@ -186,201 +518,205 @@ class CategoryPanelManager(QObject):
         # Split by newlines and add non-empty lines
         items = [line.strip() for line in text.split('\n') if line.strip()]
         
-        list_widget = self.list_widgets[key]
+        model = self.models[key]
+        in_sync = self._is_synced(key)
+        added_rows = []
         for item_text in items:
-            if self.data_manager.add_item(key, item_text, checked=True):
-                # Get the added item to get its display name
-                all_items = self.data_manager.get_all_items(key)
-                added_item = None
-                for item in all_items:
-                    if item['url'] == item_text:
-                        added_item = item
-                        break
-                
-                if added_item:
-                    display_name = added_item.get('name') or added_item['url']
-                    self._add_list_item_with_checkbox(list_widget, display_name, True, key, item_text, block_signals=False)
+            added_item = self.data_manager.add_item(key, item_text, checked=True)
+            if added_item:
+                display_name = added_item.get('name') or added_item['url']
+                added_rows.append((display_name, True, item_text))
+        model.append_rows(added_rows)
+        added_urls = [url for _, _, url in added_rows]
+        if in_sync:
+            self._mark_synced(key)
+        
+        # Fetch names for the new items in the background
+        self._fetch_names(key, added_urls)
         
         text_input.clear()
         self.data_changed.emit()
-        self.data_manager.save_database()  # Auto-save database
-    
-    def _add_list_item_with_checkbox(self, list_widget, text, checked, key, url=None, block_signals=False):
-        """Add a list item with a checkbox"""
-        item = QListWidgetItem()
-        checkbox = QCheckBox(text)
-        
-        # Store the URL in the checkbox for later reference
-        tracking_key = url if url else text
-        checkbox.setProperty("url", tracking_key)
-        checkbox.setProperty("category", key)
-        
-        # Connect signal FIRST, before setting state
-        checkbox.stateChanged.connect(self._on_checkbox_state_changed)
-        
-        # Now set the checked state
-        if block_signals:
-            checkbox.blockSignals(True)
-        checkbox.setChecked(checked)
-        if block_signals:
-            checkbox.blockSignals(False)
-        
-        list_widget.addItem(item)
-        list_widget.setItemWidget(item, checkbox)
-        item.setSizeHint(checkbox.sizeHint())
-    
-    def _on_checkbox_state_changed(self, state):
-        """Handle checkbox state change"""
-        checkbox = self.sender()
-        if not checkbox:
-            return
-            
-        url = checkbox.property("url")
-        category = checkbox.property("category")
-        checked = (state == Qt.Checked)
-        
-        if not url or not category:
-            return
-            
-        try:
-            self._update_item_checked_state(category, url, checked)
-        except Exception as e:
-            print(f"ERROR: Exception in _on_checkbox_state_changed: {e}")
-            import traceback
-            traceback.print_exc()
+        self.schedule_save()  # Auto-save database
     
     def _update_item_checked_state(self, key, url, checked):
         """Update the checked state of an item in the data"""
+        in_sync = self._is_synced(key)
         success = self.data_manager.update_item_checked_state(key, url, checked)
         if success:
+            if in_sync:
+                self._mark_synced(key)
             self.data_changed.emit()
-            self.data_manager.save_database()  # Auto-save when checkbox state changes
+            self.schedule_save()  # Auto-save when checkbox state changes
     
     def sync_ui_to_database(self):
         """Force synchronize all checkbox states from UI to database"""
-        for key, list_widget in self.list_widgets.items():
-            if key == 'max_parallel_downloads':
-                continue
-                
-            # Get all items from UI
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                checkbox = list_widget.itemWidget(item)
-                if checkbox and isinstance(checkbox, QCheckBox):
-                    url = checkbox.property("url")
-                    if url:
-                        checked = checkbox.isChecked()
-                        self.data_manager.update_item_checked_state(key, url, checked)
+        for key, model in self.models.items():
+            for _, checked, url in model.rows():
+                self.data_manager.update_item_checked_state(key, url, checked)
         
         # Save after all updates
-        self.data_manager.save_database()
+        self.schedule_save()
     
-    def _set_all_checked(self, key, list_widget, checked_state):
+    def _set_all_checked(self, key, checked_state):
         """Set all items in a category to checked or unchecked"""
+        in_sync = self._is_synced(key)
+        
         # Update data
         self.data_manager.set_all_checked(key, checked_state)
         
         # Update UI
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            checkbox = list_widget.itemWidget(item)
-            if checkbox:
-                checkbox.setChecked(checked_state)
+        self.models[key].set_all_checked(checked_state)
+        if in_sync:
+            self._mark_synced(key)
         
         self.data_changed.emit()
-        self.data_manager.save_database()  # Auto-save after bulk checkbox changes
+        self.schedule_save()  # Auto-save after bulk checkbox changes
     
-    def _remove_items(self, key, list_widget):
+    def _remove_items(self, key, list_view):
         """Remove selected items from the category"""
-        selected_items = list_widget.selectedItems()
-        for item in selected_items:
-            # Get checkbox widget
-            checkbox = list_widget.itemWidget(item)
-            if checkbox:
-                # Get the URL from the stored property or use the text as fallback
-                url = checkbox.property("url") or checkbox.text()
-                # Remove from data
-                self.data_manager.remove_item(key, url)
-                list_widget.takeItem(list_widget.row(item))
+        model = self.models[key]
+        in_sync = self._is_synced(key)
+        selected_rows = sorted(
+            (index.row() for index in list_view.selectionModel().selectedRows()),
+            reverse=True
+        )
+        for row in selected_rows:
+            # Remove from data, then from the model (bottom-up keeps rows valid)
+            self.data_manager.remove_item(key, model.url_at(row))
+            model.remove_row(row)
+        if in_sync:
+            self._mark_synced(key)
         
         self.data_changed.emit()
-        self.data_manager.save_database()  # Auto-save after removal
+        self.schedule_save()  # Auto-save after removal
     
     def add_model_from_search(self, model_type, url):
         """Add a model URL from search results"""
-        if model_type not in self.list_widgets:
-            return False
-            
-        list_widget = self.list_widgets[model_type]
-        
-        if self.data_manager.add_item(model_type, url, checked=True):
-            # Get the added item to get its display name
-            all_items = self.data_manager.get_all_items(model_type)
-            added_item = None
-            for item in all_items:
-                if item['url'] == url:
-                    added_item = item
-                    break
-            
-            if added_item:
+        in_sync = self._is_synced(model_type)
+        added_item = self.data_manager.add_item(model_type, url, checked=True)
+        if added_item:
+            # Panels that are not built yet pick the item up when first shown
+            if model_type in self.models:
                 display_name = added_item.get('name') or added_item['url']
-                self._add_list_item_with_checkbox(list_widget, display_name, True, model_type, url, block_signals=False)
-                self.data_changed.emit()
-                self.data_manager.save_database()  # Auto-save after adding from search
-                return True
+                self.models[model_type].append_row(display_name, True, url)
+                if in_sync:
+                    self._mark_synced(model_type)
+            self._fetch_names(model_type, [url])
+            self.data_changed.emit()
+            self.schedule_save()  # Auto-save after adding from search
+            return True
         
         return False
     
-    def refresh_ui_from_data(self):
-        """Refresh all UI elements from the data"""
-        # Update each category's list widget
-        for key in self.data_manager.data:
-            if key != 'max_parallel_downloads' and key in self.list_widgets:
-                list_widget = self.list_widgets[key]
-                list_widget.clear()
-                
-                for item in self.data_manager.get_all_items(key):
-                    # Use stored name if available, otherwise fetch or use URL
-                    display_name = item.get('name') or item['url']
-                    if not item.get('name'):
-                        # Try to fetch name if not stored (for backward compatibility)
-                        # Note: This could be slow, consider doing this asynchronously in the future
-                        from data_manager import fetch_model_metadata
-                        fetched_name = fetch_model_metadata(item['url'])
-                        if fetched_name:
-                            item['name'] = fetched_name
-                            display_name = fetched_name
-                    
-                    self._add_list_item_with_checkbox(
-                        list_widget,
-                        display_name,
-                        item.get('checked', True),
-                        key,
-                        item['url'],
-                        block_signals=True  # Block signals during UI refresh
-                    )
+    def _fetch_names(self, key, urls):
+        """Fetch model names for URLs without blocking the UI"""
+        for url in urls:
+            self._metadata_fetcher.fetch(key, url)
+    
+    def _queue_fetched_name(self, key, url, name):
+        """Collect a fetched name until the next batch is applied"""
+        self._fetched_names.setdefault(key, {})[url] = name
+        self._names_timer.start()
+    
+    def _apply_queued_names(self):
+        """Apply all names collected since the last batch"""
+        self._names_timer.stop()
+        fetched_names, self._fetched_names = self._fetched_names, {}
+        for key, names in fetched_names.items():
+            self._apply_fetched_names(key, names)
+    
+    def _apply_fetched_names(self, key, names):
+        """Store fetched model names and show them in the category list"""
+        in_sync = self._is_synced(key)
+        # Only fill in names still missing; a refresh may have named the item since
+        names = {url: name for url, name in names.items()
+                 if name and not (self.data_manager.get_item(key, url) or {}).get('name')
+                 and self.data_manager.set_item_name(key, url, name)}
+        if not names:
+            return
+        
+        if key in self.models:
+            self.models[key].update_display_names(names)
+            if in_sync:
+                self._mark_synced(key)
+        self.data_changed.emit()
+        self.schedule_save()
+    
+    def shutdown(self):
+        """Stop background fetches and flush pending writes"""
+        self._metadata_fetcher.abort()
+        self._apply_queued_names()
+        self.flush_pending_save()
+    
+    def refresh_check_states(self):
+        """Refresh only the check states of all lists from the data
+        
+        For changes that touched nothing but check states, such as clearing
+        all selections; it is cheaper than resetting the models.
+        """
+        for key, model in self.models.items():
+            if self._is_synced(key):
+                continue
+            model.set_checked_states({
+                item['url']: item.get('checked', True)
+                for item in self.data_manager.get_all_items(key)
+            })
+            self._mark_synced(key)
+    
+    def _on_data_changed_for(self, key):
+        """Queue a refresh for data changed outside the panels"""
+        self._stale_keys.add(key)
+        self._stale_timer.start()
+    
+    def _refresh_stale(self):
+        """Refresh the lists and settings queued by _on_data_changed_for"""
+        keys, self._stale_keys = self._stale_keys, set()
+        self.refresh_ui_from_data(only_keys=keys)
+    
+    def refresh_ui_from_data(self, only_keys=None):
+        """Refresh the built category lists whose data changed
+        
+        Args:
+            only_keys: Categories to consider, or None for all of them
+        """
+        keys = list(self.models) if only_keys is None else [k for k in only_keys if k in self.models]
+        for key in keys:
+            if not self._is_synced(key):
+                self.refresh_ui_from_data_for(key)
         
         # Update parallel downloads setting
-        if hasattr(self, 'parallel_input'):
-            self.parallel_input.setText(str(self.data_manager.data.get('max_parallel_downloads', 4)))
-    
-    def get_category_index_map(self):
-        """Get mapping of category keys to stacked widget indices"""
-        return {
-            "settings": 0,
-            "apt_packages": 1,
-            "pip_packages": 2,
-            "nodes": 3,
-            "workflows": 4,
-            "checkpoint_models": 5,
-            "unet_models": 6,
-            "diffusion_models": 7,
-            "lora_models": 8,
-            "vae_models": 9,
-            "controlnet_models": 10,
-            "esrgan_models": 11,
-            "upscale_models": 12,
-            "annotator_models": 13,
-            "clip_vision_models": 14,
-            "text_encoder_models": 15,
-        }
\ No newline at end of file
+        if hasattr(self, 'parallel_input') and (only_keys is None or 'max_parallel_downloads' in only_keys):
+            text = str(self.data_manager.data.get('max_parallel_downloads', 4))
+            if self.parallel_input.text() != text:
+                self.parallel_input.setText(text)
+    
+    def refresh_ui_from_data_for(self, key):
+        """Reset a single category's model from the data in one go"""
+        if key not in self.models:
+            return
+        
+        rows = []
+        unnamed_urls = []
+        for item in self.data_manager.get_all_items(key):
+            # Show the URL until a name has been fetched in the background
+            display_name = item.get('name') or item['url']
+            if not item.get('name'):
+                unnamed_urls.append(item['url'])
+            
+            rows.append((display_name, item.get('checked', True), item['url']))
+        
+        # One repaint for the reset rather than one per layout pass
+        list_view = self.list_views[key]
+        list_view.setUpdatesEnabled(False)
+        self.models[key].set_rows(rows)
+        list_view.setUpdatesEnabled(True)
+        self._mark_synced(key)
+        self._fetch_names(key, unnamed_urls)
+    
+    def _is_synced(self, key):
+        """Check whether a category's model mirrors the current data"""
+        return self._shown_revs.get(key) == self.data_manager.category_revision(key)
+    
+    def _mark_synced(self, key):
+        """Record that a category's model mirrors the current data"""
+        self._shown_revs[key] = self.data_manager.category_revision(key)
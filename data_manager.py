@@ -8,95 +8,346 @@ Handles database operations and data persistence for the provisioning GUI.
 import json
 import os
 import re
+import tempfile
+import threading
+import time
 import requests
 import urllib.parse
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def fetch_model_metadata(url):
-    """Fetch model metadata from URL to get the model name"""
+
+def parse_json(payload):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _dump_json(data, pretty=False):
+    """Serialize data to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+# Shared by all metadata fetches so concurrent refreshes reuse connections
+_SESSION = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """Get the shared HTTP session, creating it on first use"""
+    global _SESSION
+    with _session_lock:
+        if _SESSION is None:
+            session = requests.Session()
+            # Enough pooled connections per host for every refresh worker
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            session.headers['User-Agent'] = 'vastai-templates/1.0'
+            _SESSION = session
+        return _SESSION
+
+
+def _load_json(path):
+    """Read and parse a JSON file, using orjson when it is installed"""
+    with open(path, 'rb') as f:
+        return parse_json(f.read())
+
+
+def _write_atomic(path, payload):
+    """Write bytes to a temporary file and rename it over path"""
+    # A unique name in the same directory, so concurrent writers never share
+    # a temporary file and the rename stays on one filesystem
+    tmp = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + '.',
+        suffix='.tmp', delete=False)
     try:
-        # CivitAI API URL pattern
-        if 'civitai.com/api/download/models/' in url:
-            # Extract model version ID from URL
-            match = re.search(r'/models/(\d+)', url)
-            if match:
-                model_version_id = match.group(1)
-                api_url = f"https://civitai.com/api/v1/model-versions/{model_version_id}"
-                
-                response = requests.get(api_url, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    model_name = data.get('model', {}).get('name', 'Unknown Model')
-                    version_name = data.get('name', '')
-                    creator = data.get('model', {}).get('creator', {}).get('username', 'Unknown')
-                    
-                    # Format: "🎨 Model Name (Version) by Creator"
-                    full_name = f"🎨 {model_name}"
-                    if version_name and version_name.lower() != model_name.lower():
-                        full_name += f" ({version_name})"
-                    full_name += f" by {creator}"
-                    
-                    return full_name
-        
-        # CivitAI direct URL pattern
-        elif 'civitai.com' in url and '/models/' in url:
-            return f"🎨 {_extract_filename_from_url(url)}"
-        
-        # Hugging Face URL pattern
-        elif 'huggingface.co' in url:
-            # Extract model repo from URL
-            match = re.search(r'huggingface\.co/([^/]+/[^/]+)', url)
-            if match:
-                repo_id = match.group(1)
-                
-                # Extract filename from URL if present - expanded patterns
-                filename_match = re.search(r'/([^/]+\.(safetensors|ckpt|pt|bin|pth|json|yaml|yml))(?:\?|$)', url)
-                if filename_match:
-                    filename = filename_match.group(1)
-                    # For specific filenames, use the filename as the main identifier
-                    return f"🤗 {filename}"
-                else:
-                    # For general repo access, use repo name
-                    return f"🤗 {repo_id}"
-        
-        # GitHub URL pattern for nodes
-        elif 'github.com' in url:
-            match = re.search(r'github\.com/([^/]+/[^/]+)', url)
-            if match:
-                repo_name = match.group(1)
-                return f"📁 {repo_name}"
-        
-        # Google Drive pattern
-        elif 'drive.google.com' in url or 'googleapis.com' in url:
-            filename = _extract_filename_from_url(url)
-            return f"💾 {filename}" if filename else "💾 Google Drive File"
-        
-        # OneDrive/SharePoint pattern
-        elif 'onedrive.live.com' in url or 'sharepoint.com' in url or '1drv.ms' in url:
-            filename = _extract_filename_from_url(url)
-            return f"☁️ {filename}" if filename else "☁️ OneDrive File"
-        
-        # Dropbox pattern
-        elif 'dropbox.com' in url:
-            filename = _extract_filename_from_url(url)
-            return f"📦 {filename}" if filename else "📦 Dropbox File"
+        with tmp:
+            tmp.write(payload)
+        # Temporary files are private; keep the mode a plain write would give
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tmp.name, mode)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+class MetadataCache:
+    """Persistent TTL cache for model names that needed a network request"""
+    
+    # Cache lifetime per host in days, names on these hosts rarely change
+    TTL_DAYS = {
+        'civitai.com': 180,
+        'huggingface.co': 30,
+    }
+    DEFAULT_TTL_DAYS = 30
+    
+    def __init__(self, cache_file='metadata_cache.json'):
+        self.cache_file = cache_file
+        self.entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Load cached entries from disk"""
+        try:
+            if os.path.exists(self.cache_file):
+                entries = _load_json(self.cache_file)
+                with self._lock:
+                    self.entries = entries
+                    self._dirty = False
+        except Exception as e:
+            print(f"Error loading metadata cache: {e}")
+    
+    def save(self):
+        """Save the cache to disk if it changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self.entries)
+            self._dirty = False
+        try:
+            _write_atomic(self.cache_file, _dump_json(entries))
+        except Exception as e:
+            print(f"Error saving metadata cache: {e}")
+    
+    def get(self, url):
+        """Get the cached name for a URL, or None if missing or expired"""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return None
+        if time.time() - entry['fetched_at'] > entry['ttl_minutes'] * 60:
+            return None
+        return entry['name']
+    
+    def put(self, url, name, etag=None, last_modified=None):
+        """Store a freshly fetched name for a URL with its HTTP validators"""
+        host = urllib.parse.urlparse(url).netloc.lower().removeprefix('www.')
+        ttl_days = self.TTL_DAYS.get(host, self.DEFAULT_TTL_DAYS)
+        entry = {
+            'name': name,
+            'fetched_at': time.time(),
+            'ttl_minutes': ttl_days * 24 * 60
+        }
+        if etag:
+            entry['etag'] = etag
+        if last_modified:
+            entry['last_modified'] = last_modified
+        with self._lock:
+            self.entries[url] = entry
+            self._dirty = True
+    
+    def conditional_headers(self, url):
+        """Get If-None-Match/If-Modified-Since headers for revalidating a URL
         
-        # Direct file URLs (many annotator models)
-        elif any(ext in url.lower() for ext in ['.pth', '.onnx', '.pkl', '.bin', '.safetensors', '.pt']):
-            filename = _extract_filename_from_url(url)
-            # Try to determine platform from domain
-            if 'huggingface.co' in url:
-                return f"🤗 {filename}"
-            elif 'github.com' in url or 'githubusercontent.com' in url:
-                return f"📁 {filename}"
-            else:
-                return f"🔗 {filename}"
+        Expired entries still count, that is when they are needed.
+        """
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return {}
         
-        # Fallback: try to extract filename from URL
-        filename = _extract_filename_from_url(url)
-        if filename:
-            return f"🔗 {filename}"
-            
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def revalidate(self, url):
+        """Mark a cached name fresh again after a 304 and return it"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if not entry:
+                return None
+            entry['fetched_at'] = time.time()
+            self._dirty = True
+            return entry['name']
+
+
+# URL patterns, compiled once at import time
+_CIVITAI_ID = re.compile(r'/models/(\d+)')
+_HF_REPO = re.compile(r'huggingface\.co/([^/]+/[^/]+)')
+_HF_FILE = re.compile(r'/([^/]+\.(?:safetensors|ckpt|pt|bin|pth|json|yaml|yml))(?:\?|$)')
+_GITHUB_REPO = re.compile(r'github\.com/([^/]+/[^/]+)')
+_DIRECT_EXT = re.compile(r'\.(?:pth|onnx|pkl|bin|safetensors|pt)', re.IGNORECASE)
+
+
+def civitai_version_api_url(url):
+    """Get the model-version API URL for a CivitAI download link, or None
+    
+    These are the only URLs whose name needs a network request.
+    """
+    if 'civitai.com' not in url or '/api/download/models/' not in url:
+        return None
+    
+    # Extract model version ID from URL
+    match = _CIVITAI_ID.search(url)
+    if match:
+        return f"https://civitai.com/api/v1/model-versions/{match.group(1)}"
+    return None
+
+
+def civitai_version_name(data):
+    """Format a CivitAI model-version API response as a display name"""
+    model_name = data.get('model', {}).get('name', 'Unknown Model')
+    version_name = data.get('name', '')
+    creator = data.get('model', {}).get('creator', {}).get('username', 'Unknown')
+    
+    # Format: "🎨 Model Name (Version) by Creator"
+    full_name = f"🎨 {model_name}"
+    if version_name and version_name.lower() != model_name.lower():
+        full_name += f" ({version_name})"
+    full_name += f" by {creator}"
+    return full_name
+
+
+def _handle_civitai(url, cache=None):
+    """Name CivitAI URLs, using the API for download links"""
+    if '/api/download/models/' in url:
+        api_url = civitai_version_api_url(url)
+        if api_url:
+            headers = cache.conditional_headers(url) if cache is not None else {}
+            response = _get_session().get(api_url, headers=headers, timeout=10)
+            if response.status_code == 304 and cache is not None:
+                # Unchanged since the cached copy, no body to parse
+                full_name = cache.revalidate(url)
+                if full_name:
+                    return full_name
+            if response.status_code == 200:
+                full_name = civitai_version_name(parse_json(response.content))
+                if cache is not None:
+                    cache.put(
+                        url, full_name,
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified')
+                    )
+                return full_name
+        return None
+    
+    # CivitAI direct URL pattern
+    if '/models/' in url:
+        return f"🎨 {_extract_filename_from_url(url)}"
+    return None
+
+
+def _handle_huggingface(url, cache=None):
+    """Name Hugging Face URLs by file name, or by repo for general access"""
+    match = _HF_REPO.search(url)
+    if not match:
+        return None
+    
+    filename_match = _HF_FILE.search(url)
+    if filename_match:
+        # For specific filenames, use the filename as the main identifier
+        return f"🤗 {filename_match.group(1)}"
+    return f"🤗 {match.group(1)}"
+
+
+def _handle_github(url, cache=None):
+    """Name GitHub URLs for nodes by owner/repo"""
+    match = _GITHUB_REPO.search(url)
+    if match:
+        return f"📁 {match.group(1)}"
+    return None
+
+
+def _handle_google_drive(url, cache=None):
+    """Name Google Drive and Google Cloud Storage URLs"""
+    filename = _extract_filename_from_url(url)
+    return f"💾 {filename}" if filename else "💾 Google Drive File"
+
+
+def _handle_onedrive(url, cache=None):
+    """Name OneDrive and SharePoint URLs"""
+    filename = _extract_filename_from_url(url)
+    return f"☁️ {filename}" if filename else "☁️ OneDrive File"
+
+
+def _handle_dropbox(url, cache=None):
+    """Name Dropbox URLs"""
+    filename = _extract_filename_from_url(url)
+    return f"📦 {filename}" if filename else "📦 Dropbox File"
+
+
+def _handle_fallback(url, cache=None):
+    """Name direct file URLs (many annotator models) and anything else"""
+    filename = _extract_filename_from_url(url)
+    if _DIRECT_EXT.search(url):
+        # Try to determine platform from domain
+        if 'github.com' in url or 'githubusercontent.com' in url:
+            return f"📁 {filename}"
+        return f"🔗 {filename}"
+    
+    if filename:
+        return f"🔗 {filename}"
+    return None
+
+
+def fallback_model_name(url):
+    """Name a URL from its file name alone, without any network request"""
+    return _handle_fallback(url)
+
+
+# Handlers keyed by host; subdomains fall back to their parent domain
+_HANDLERS = {
+    'civitai.com': _handle_civitai,
+    'huggingface.co': _handle_huggingface,
+    'github.com': _handle_github,
+    'drive.google.com': _handle_google_drive,
+    'googleapis.com': _handle_google_drive,
+    'onedrive.live.com': _handle_onedrive,
+    'sharepoint.com': _handle_onedrive,
+    '1drv.ms': _handle_onedrive,
+    'dropbox.com': _handle_dropbox,
+}
+
+
+def _handler_for_host(host):
+    """Find the handler for a host, trying parent domains for subdomains"""
+    while host:
+        handler = _HANDLERS.get(host)
+        if handler:
+            return handler
+        _, _, host = host.partition('.')
+    return _handle_fallback
+
+
+def fetch_model_metadata(url, cache=None, refresh=False):
+    """
+    Fetch model metadata from URL to get the model name
+    
+    Args:
+        url: Model URL
+        cache: Optional MetadataCache consulted before any network request
+        refresh: Ignore cached names (fresh results are still written back)
+    """
+    if cache is not None and not refresh:
+        cached_name = cache.get(url)
+        if cached_name:
+            return cached_name
+    
+    try:
+        host = urllib.parse.urlparse(url).netloc.lower().removeprefix('www.')
+        handler = _handler_for_host(host)
+        name = handler(url, cache)
+        if name is None and handler is not _handle_fallback:
+            name = _handle_fallback(url, cache)
+        return name
     except Exception as e:
         print(f"Error fetching metadata for {url}: {e}")
     
@@ -147,35 +398,53 @@ class DataManager:
     def __init__(self, database_file='model_database.json'):
         self.database_file = database_file
         self.data = self._get_default_data()
+        self.metadata_cache = MetadataCache()
+        self._saved_digest = None
+        # Revision the database file is known to hold
+        self._saved_revision = None
+        # Item categories; each maps url -> item in insertion order
+        self._categories = tuple(key for key in self.data if key != 'max_parallel_downloads')
+        # Per-category revision counters, bumped on every mutation
+        self._rev = {key: 0 for key in self._categories}
+        # Revision of the whole database, including settings
+        self.revision = 0
+        # Callables notified with the key of each changed category or setting
+        self._listeners = []
+        # Nesting depth of batch() blocks, and the keys they changed so far
+        self._batch_depth = 0
+        self._pending_keys = {}
     
     def _get_default_data(self):
-        """Get the default data structure"""
+        """Get the default data structure
+        
+        Each category is a {url: item} dict; it is saved as a list of items.
+        """
         return {
-            'apt_packages': [],
-            'pip_packages': [],
-            'nodes': [],
-            'workflows': [],
-            'checkpoint_models': [],
-            'unet_models': [],
-            'lora_models': [],
-            'vae_models': [],
-            'esrgan_models': [],
-            'upscale_models': [],
-            'controlnet_models': [],
-            'annotator_models': [],
-            'clip_vision_models': [],
-            'text_encoder_models': [],
-            'diffusion_models': [],
+            'apt_packages': {},
+            'pip_packages': {},
+            'nodes': {},
+            'workflows': {},
+            'checkpoint_models': {},
+            'unet_models': {},
+            'lora_models': {},
+            'vae_models': {},
+            'esrgan_models': {},
+            'upscale_models': {},
+            'controlnet_models': {},
+            'annotator_models': {},
+            'clip_vision_models': {},
+            'text_encoder_models': {},
+            'diffusion_models': {},
             'max_parallel_downloads': 4
         }
     
     def load_database(self):
         """Load the database from JSON file"""
+        self.metadata_cache.load()
         try:
             if os.path.exists(self.database_file):
-                with open(self.database_file, 'r') as f:
-                    loaded_data = json.load(f)
-                    
+                loaded_data = _load_json(self.database_file)
+                
                 # Merge with existing data structure
                 for key in self.data:
                     if key in loaded_data:
@@ -183,132 +452,246 @@ class DataManager:
                             self.data[key] = loaded_data[key]
                         else:
                             # Ensure all items have the new format
-                            items = loaded_data[key]
-                            if items and isinstance(items[0], str):
-                                # Old format - convert to new with name fetching
-                                self.data[key] = [{'url': url, 'checked': True, 'name': None} for url in items]
-                            else:
-                                # New format - ensure name field exists
-                                converted_items = []
-                                for item in items:
-                                    if isinstance(item, dict):
-                                        # Add name field if missing
-                                        if 'name' not in item:
-                                            item['name'] = None
-                                        converted_items.append(item)
-                                    else:
-                                        # Legacy string format
-                                        converted_items.append({'url': item, 'checked': True, 'name': None})
-                                self.data[key] = converted_items
+                            converted_items = {}
+                            for item in loaded_data[key]:
+                                if isinstance(item, dict):
+                                    # Add name field if missing
+                                    if 'name' not in item:
+                                        item['name'] = None
+                                else:
+                                    # Legacy string format
+                                    item = {'url': item, 'checked': True, 'name': None}
+                                converted_items[item['url']] = item
+                            self.data[key] = converted_items
                 
         except Exception as e:
             print(f"Error loading database: {e}")
+        
+        # Name legacy items from the metadata cache once, here, so the UI
+        # never has to look names up while refreshing
+        for key in self._categories:
+            for item in self.data[key].values():
+                if not item.get('name'):
+                    item['name'] = self.metadata_cache.get(item['url'])
+            self._touch(key)
+    
+    def _touch(self, category):
+        """Record that a category's items changed"""
+        self._rev[category] += 1
+        self.revision += 1
+        self._notify(category)
+    
+    def add_listener(self, callback):
+        """Call callback(key) after a category's items or a setting changes"""
+        self._listeners.append(callback)
+    
+    def _notify(self, key):
+        """Tell listeners that the data under key changed"""
+        if self._batch_depth:
+            self._pending_keys[key] = None
+            return
+        for callback in self._listeners:
+            callback(key)
+    
+    @contextmanager
+    def batch(self):
+        """Hold back listener calls until the outermost batch ends
+        
+        Each changed key is then notified once, however often it changed.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                keys, self._pending_keys = self._pending_keys, {}
+                for key in keys:
+                    self._notify(key)
+    
+    def category_revision(self, category):
+        """Get a counter that changes whenever a category's items change"""
+        return self._rev.get(category, 0)
     
     def save_database(self):
-        """Save the entire database to a JSON file"""
+        """Save the entire database to a compact JSON file"""
+        if self.has_unsaved_changes():
+            self.save_snapshot(self.snapshot(), self.revision)
+        else:
+            self.metadata_cache.save()
+    
+    def has_unsaved_changes(self):
+        """Check whether the data changed since it was last saved"""
+        return self.revision != self._saved_revision
+    
+    def snapshot(self):
+        """Copy the data in its on-disk schema, safe to save from another thread"""
+        return {key: [dict(item) for item in value.values()] if isinstance(value, dict) else value
+                for key, value in self.data.items()}
+    
+    def save_snapshot(self, snapshot, revision=None):
+        """Save a snapshot taken by snapshot() at revision to the database file"""
         try:
-            with open(self.database_file, 'w') as f:
-                json.dump(self.data, f, indent=2)
+            payload = _dump_json(snapshot)
+            # Skip the write entirely when nothing changed since the last save
+            digest = hash(payload)
+            if digest != self._saved_digest:
+                _write_atomic(self.database_file, payload)
+                self._saved_digest = digest
+            if revision is not None:
+                self._saved_revision = revision
         except Exception as e:
             print(f"Error saving database: {e}")
+        
+        self.metadata_cache.save()
     
+    def export_database(self, path):
+        """Write a pretty-printed copy of the database to path"""
+        _write_atomic(path, _dump_json(self.snapshot(), pretty=True))
     
-    def add_item(self, category, url, checked=True):
-        """Add an item to a category"""
-        if category not in self.data or category == 'max_parallel_downloads':
-            return False
+    def add_item(self, category, url, checked=True, name=None):
+        """Add an item to a category
+        
+        The model name is not fetched here so callers never block on the
+        network; items without a name are named later with set_item_name.
+        
+        Returns:
+            The created item dict, or None if the category is unknown or
+            the URL already exists
+        """
+        if category not in self._categories:
+            return None
             
         # Check if item already exists
-        if any(item['url'] == url for item in self.data[category]):
-            return False
+        if url in self.data[category]:
+            return None
             
-        # Fetch model name for display
-        model_name = fetch_model_metadata(url)
-        
         # Add to data with checked state and name
         item_data = {
             'url': url,
             'checked': checked,
-            'name': model_name
+            'name': name
         }
-        self.data[category].append(item_data)
-        return True
+        self.data[category][url] = item_data
+        self._touch(category)
+        return item_data
     
     def remove_item(self, category, url):
         """Remove an item from a category"""
-        if category not in self.data or category == 'max_parallel_downloads':
+        if category not in self._categories:
             return False
             
-        self.data[category] = [item for item in self.data[category] if item['url'] != url]
+        if self.data[category].pop(url, None) is not None:
+            self._touch(category)
         return True
     
     def update_item_checked_state(self, category, url, checked):
         """Update the checked state of an item"""
-        if category not in self.data or category == 'max_parallel_downloads':
+        if category not in self._categories:
             return False
         
+        item = self.data[category].get(url)
+        if item is None:
+            return False
         
-        for i, item in enumerate(self.data[category]):
-            if item['url'] == url:
-                old_state = item.get('checked', True)
-                item['checked'] = checked
-                return True
+        if item['checked'] != checked:
+            item['checked'] = checked
+            self._touch(category)
+        return True
+    
+    def set_item_name(self, category, url, name):
+        """Update the display name of an item"""
+        if category not in self._categories:
+            return False
+        
+        item = self.data[category].get(url)
+        if item is None:
+            return False
         
-        return False
+        if item.get('name') != name:
+            item['name'] = name
+            self._touch(category)
+        return True
     
     def set_all_checked(self, category, checked_state):
         """Set all items in a category to checked or unchecked"""
-        if category not in self.data or category == 'max_parallel_downloads':
+        if category not in self._categories:
             return False
             
-        for item in self.data[category]:
+        for item in self.data[category].values():
             item['checked'] = checked_state
+        self._touch(category)
         return True
     
     def clear_all_selections(self):
-        """Uncheck all models in the database"""
-        for key in self.data:
-            if key != 'max_parallel_downloads':
-                for item in self.data[key]:
+        """Uncheck all models in the database
+        
+        Returns:
+            Dict mapping each category to the URLs that were checked, which
+            restore_selections accepts to undo the clear
+        """
+        cleared = {}
+        for key in self._categories:
+            urls = [item['url'] for item in self.data[key].values() if item.get('checked', True)]
+            if urls:
+                for item in self.data[key].values():
                     item['checked'] = False
+                cleared[key] = urls
+                self._touch(key)
+        return cleared
+    
+    def restore_selections(self, checked):
+        """Check the URLs of a {category: [url]} dict again, skipping removed items"""
+        for key, urls in checked.items():
+            items = self.data.get(key, {})
+            restored = False
+            for url in urls:
+                item = items.get(url)
+                if item is not None and not item.get('checked', True):
+                    item['checked'] = True
+                    restored = True
+            if restored:
+                self._touch(key)
     
     def get_checked_items(self, category):
         """Get all checked items for a category"""
-        if category not in self.data or category == 'max_parallel_downloads':
+        if category not in self._categories:
             return []
-        return [item for item in self.data[category] if item.get('checked', True)]
+        return [item for item in self.data[category].values() if item.get('checked', True)]
+    
+    def get_item(self, category, url):
+        """Get a single item by URL, or None if it is not in the category"""
+        if category not in self._categories:
+            return None
+        return self.data[category].get(url)
     
     def get_all_items(self, category):
         """Get all items for a category"""
-        if category not in self.data or category == 'max_parallel_downloads':
+        if category not in self._categories:
             return []
-        return self.data[category]
+        return list(self.data[category].values())
     
     def update_max_parallel_downloads(self, value):
         """Update the max parallel downloads setting"""
         try:
-            self.data['max_parallel_downloads'] = int(value)
-            return True
+            value = int(value)
         except (ValueError, TypeError):
             return False
+        if self.data['max_parallel_downloads'] != value:
+            self.data['max_parallel_downloads'] = value
+            self.revision += 1
+            self._notify('max_parallel_downloads')
+        return True
     
     
-    def refresh_all_model_names(self, progress_callback=None):
-        """Refresh all model names from their sources"""
+    def names_to_refresh(self):
+        """Get the item count and the (category, url) pairs whose names should be refetched"""
         total_items = 0
-        refreshed = 0
-        
-        # Count total items
-        for key in self.data:
-            if key != 'max_parallel_downloads':
-                total_items += len(self.data[key])
+        to_fetch = []
         
-        # Refresh each category
-        for key in self.data:
-            if key == 'max_parallel_downloads':
-                continue
-                
-            for item in self.data[key]:
+        for key in self._categories:
+            for item in self.data[key].values():
+                total_items += 1
                 # Always try to refresh if:
                 # 1. No name exists
                 # 2. Name is same as URL
@@ -318,17 +701,29 @@ class DataManager:
                     item['name'] == item['url'] or
                     any(emoji in item.get('name', '') for emoji in ['🎨', '🤗', '📁', '💾', '☁️', '📦', '🔗'])
                 )
-                
                 if should_refresh:
-                    # Fetch new name
-                    new_name = fetch_model_metadata(item['url'])
-                    if new_name and new_name != item['url']:
-                        item['name'] = new_name
-                    
-                refreshed += 1
-                if progress_callback:
-                    progress_callback(refreshed, total_items)
+                    to_fetch.append((key, item['url']))
         
-        # Save the updated database
-        self.save_database()
-        return refreshed, total_items
\ No newline at end of file
+        return total_items, to_fetch
+    
+    def iter_refreshed_names(self, to_fetch, max_workers=8):
+        """Fetch fresh names concurrently, yielding (category, url, name) as each arrives
+        
+        May run on any thread: fresh names are written back to the metadata
+        cache, which guards its entries with a lock, and the database is not
+        touched. Closing the generator early cancels the fetches that have
+        not started yet.
+        """
+        if not to_fetch:
+            return
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_fetch))))
+        try:
+            futures = {
+                executor.submit(fetch_model_metadata, url, self.metadata_cache, True): (key, url)
+                for key, url in to_fetch
+            }
+            for future in as_completed(futures):
+                key, url = futures[future]
+                yield key, url, future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
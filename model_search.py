@@ -5,170 +5,459 @@ Model Search Module
 Handles searching for models on CivitAI and Hugging Face platforms.
 """
 
-import requests
+import hashlib
+import heapq
+import html
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QPushButton,
     QLabel, QProgressBar, QScrollArea, QFrame, QMessageBox
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, Signal, QStandardPaths, QUrl
+)
+from PySide6.QtGui import QPixmap, QPainter, QPalette, QTextDocument, QAbstractTextDocumentLayout
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _loads(payload):
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+# (connect, read) timeouts; a dead host fails fast instead of using the read budget
+_REQUEST_TIMEOUT = (3.05, 8)
+# Longest Retry-After wait honored before retrying, in seconds
+_MAX_RETRY_AFTER = 5
+
+
+def _create_session():
+    """Create a session that keeps connections alive between searches"""
+    # requests is only imported once the first search needs it
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    class _Retry(Retry):
+        """Retry that waits out Retry-After, but never long enough to stall a search"""
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            if retry_after is None:
+                return None
+            return min(retry_after, _MAX_RETRY_AFTER)
+    
+    session = requests.Session()
+    retries = _Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                     respect_retry_after_header=True)
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+    session.headers['User-Agent'] = 'vastai-templates/1.0'
+    return session
+
+
+# Shared by all search workers so repeat searches skip the TLS handshake
+_SESSION = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """Get the shared session, creating it on first use"""
+    global _SESSION
+    with _session_lock:
+        if _SESSION is None:
+            _SESSION = _create_session()
+        return _SESSION
+
+
+def warm_up_session():
+    """Import requests and build the shared session ahead of the first search"""
+    _get_session()
+
+# Shorter queries return noisy, slow results
+_MIN_QUERY_LENGTH = 3
+
+# Results shown for a combined search across platforms
+_MAX_RESULTS = 20
+
+# Downloaded result thumbnails, named by a hash of their URL
+_IMAGE_CACHE_DIR = Path(
+    QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+) / 'vastai-templates' / 'thumbnails'
+_THUMBNAIL_SIZE = 96
+# Size the thumbnail cache is pruned back to, least recently used first
+_IMAGE_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+def _prune_image_cache(max_bytes=_IMAGE_CACHE_MAX_BYTES):
+    """Delete the least recently used thumbnails until the cache fits max_bytes"""
+    try:
+        entries = []
+        for path in _IMAGE_CACHE_DIR.iterdir():
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return  # No cache yet
+    
+    total = sum(size for _, size, _ in entries)
+    # Cache hits refresh the mtime, so the oldest files go first
+    for _, size, path in sorted(entries, key=itemgetter(0)):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError as e:
+            print(f"Error pruning thumbnail cache: {e}")
+
+# Runs the per-platform requests of a combined search side by side
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")
+
+# Map model types to CivitAI types
+_CIVITAI_TYPE_MAP = MappingProxyType({
+    "checkpoint_models": "Checkpoint",
+    "lora_models": "LORA",
+    "vae_models": "VAE",
+    "controlnet_models": "ControlNet",
+    "upscale_models": "Upscaler",
+    "workflows": "Workflows",
+    "text_encoder_models": "TextualInversion",
+    "diffusion_models": "Checkpoint"
+})
+
+# Map model types to HF tags
+_HF_TAG_MAP = MappingProxyType({
+    "checkpoint_models": "diffusers",
+    "lora_models": "lora",
+    "controlnet_models": "controlnet",
+    "vae_models": "vae"
+})
+
+# Map UI model type selection to internal type
+_UI_TYPE_MAP = MappingProxyType({
+    "Checkpoints": "checkpoint_models",
+    "LoRA": "lora_models",
+    "VAE": "vae_models",
+    "ControlNet": "controlnet_models",
+    "Upscale Models": "upscale_models",
+    "Workflows": "workflows",
+    "Text Encoders": "text_encoder_models",
+    "Diffusion Models": "diffusion_models"
+})
+
+
+# HTML tags in CivitAI descriptions
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _truncate(text, max_length=200):
+    """Strip HTML tags and truncate with ellipsis if too long"""
+    text = _TAG_RE.sub('', text)
+    return text if len(text) <= max_length else text[:max_length] + "..."
+
+
+def _iter_civitai_items(response):
+    """Yield the items of a CivitAI response, one at a time with ijson
+    
+    Streaming keeps only the current item in memory instead of the whole
+    response with every description and image list.
+    """
+    if ijson is not None:
+        response.raw.decode_content = True
+        yield from ijson.items(response.raw, 'items.item', use_float=True)
+    else:
+        yield from _loads(response.content).get("items", [])
+
+
+def _civitai_result(item, model_type):
+    """Project a CivitAI API item into a search result, or None if unusable"""
+    # Get the latest version
+    versions = item.get("modelVersions", [])
+    if not versions:
+        return None
+        
+    latest_version = versions[0]
+    files = latest_version.get("files", [])
+    
+    # Find primary file or workflow file
+    primary_file = None
+    for file in files:
+        if file.get("primary", False):
+            primary_file = file
+            break
+    
+    # If no primary file, look for workflow files (.json)
+    if not primary_file and model_type == "workflows":
+        for file in files:
+            if file.get("name", "").endswith(".json"):
+                primary_file = file
+                break
+    
+    if not primary_file:
+        return None
+        
+    download_url = primary_file.get("downloadUrl")
+    if not download_url:
+        return None
+        
+    creator = item.get("creator") or {}
+    stats = item.get("stats") or {}
+    images = latest_version.get("images") or ()
+    return {
+        "title": item.get("name", "Unknown"),
+        "author": creator.get("username", "Unknown"),
+        "description": _truncate(item.get("description") or ""),
+        "download_url": download_url,
+        "rating": stats.get("rating", 0),
+        "downloads": stats.get("downloadCount", 0),
+        "type": item.get("type", "Unknown"),
+        "platform": "civitai",
+        "image_url": images[0].get("url") if images else None
+    }
+
+
+def _do_civitai(query, model_type):
+    """Search CivitAI models without touching the search cache"""
+    url = "https://civitai.com/api/v1/models"
+    # CivitAI sends every version, file and image of each model; 12 results
+    # fill the fixed-size search dialog, and NSFW models are left out
+    params = {
+        "query": query,
+        "limit": 12,
+        "sort": "Most Downloaded",
+        "nsfw": "false"
+    }
+    
+    if model_type in _CIVITAI_TYPE_MAP:
+        params["types"] = _CIVITAI_TYPE_MAP[model_type]
+        
+    with _get_session().get(url, params=params, timeout=_REQUEST_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        
+        results = []
+        for item in _iter_civitai_items(response):
+            result = _civitai_result(item, model_type)
+            if result:
+                results.append(result)
+    
+    # Already in download order, the API sorts by "Most Downloaded"
+    return results
+
+
+def _do_hf(query, model_type):
+    """Search Hugging Face models without touching the search cache"""
+    url = "https://huggingface.co/api/models"
+    params = {
+        "search": query,
+        "limit": 20,
+        "sort": "downloads",
+        "direction": -1,
+        # Only the summary fields are used, never the full card or config
+        "full": "false",
+        "config": "false"
+    }
+    
+    if model_type in _HF_TAG_MAP:
+        params["filter"] = _HF_TAG_MAP[model_type]
+        
+    response = _get_session().get(url, params=params, timeout=_REQUEST_TIMEOUT)
+    response.raise_for_status()
+    
+    data = _loads(response.content)
+    results = []
+    
+    for item in data:
+        # Construct download URL for git clone or direct file access
+        model_id = item.get("modelId", "")
+        if not model_id:
+            continue
+            
+        # For most models, we'll use the git clone URL
+        download_url = f"https://huggingface.co/{model_id}"
+        
+        author, has_author, title = model_id.partition("/")
+        if not has_author:
+            author, title = "Unknown", model_id
+        pipeline_tag = item.get("pipeline_tag") or ""
+        tags = item.get("tags") or ()
+        results.append({
+            "title": title,
+            "author": author,
+            "description": pipeline_tag + " - " + ", ".join(tags[:3]),
+            "download_url": download_url,
+            "downloads": item.get("downloads", 0),
+            "likes": item.get("likes", 0),
+            "type": pipeline_tag or "Unknown",
+            "platform": "huggingface",
+            "last_modified": item.get("lastModified", "")
+        })
+    
+    # Already in download order, the API sorts by downloads descending
+    return results
+
+
+# Recent search results, (platform, query, model_type) -> (timestamp, results)
+_SEARCH_CACHE = OrderedDict()
+_SEARCH_CACHE_SIZE = 64
+_SEARCH_CACHE_TTL = 300  # seconds
+_search_cache_lock = threading.Lock()
 
 
-class SearchWorker(QThread):
-    """Worker thread for searching models on different platforms"""
-    results_ready = Signal(list)
-    error_occurred = Signal(str)
+def _cached_search(platform, query, model_type, search):
+    """Run search(query, model_type), reusing results from the last few minutes"""
+    # Both APIs ignore case and repeated spaces, so such variants share an entry
+    key = (platform, ' '.join(query.split()).casefold(), model_type)
+    with _search_cache_lock:
+        cached = _SEARCH_CACHE.get(key)
+        if cached and time.monotonic() - cached[0] < _SEARCH_CACHE_TTL:
+            _SEARCH_CACHE.move_to_end(key)
+            return list(cached[1])
+    
+    results = search(query, model_type)
+    
+    with _search_cache_lock:
+        _SEARCH_CACHE[key] = (time.monotonic(), results)
+        _SEARCH_CACHE.move_to_end(key)
+        while len(_SEARCH_CACHE) > _SEARCH_CACHE_SIZE:
+            _SEARCH_CACHE.popitem(last=False)
+    return list(results)
+
+
+class SearchWorker(QRunnable):
+    """Searches models on different platforms on the shared Qt thread pool"""
+    
+    class _Signals(QObject):
+        results_ready = Signal(list)
+        error_occurred = Signal(str)
+        finished = Signal()
     
     def __init__(self, platform, query, model_type):
         super().__init__()
+        self.signals = self._Signals()
         self.platform = platform
         self.query = query
         self.model_type = model_type
+        self._cancelled = False
+    
+    def cancel(self):
+        """Drop the results of this search; a running request still completes"""
+        self._cancelled = True
         
     def run(self):
         try:
+            if self._cancelled:
+                return
             if self.platform == "civitai":
                 results = self.search_civitai()
             elif self.platform == "huggingface":
                 results = self.search_huggingface()
+            elif self.platform == "both":
+                results = self.search_all()
             else:
                 results = []
-            self.results_ready.emit(results)
+            # A newer search superseded this one while it was running
+            if self._cancelled:
+                return
+            self.signals.results_ready.emit(results)
         except Exception as e:
-            self.error_occurred.emit(str(e))
+            if not self._cancelled:
+                self.signals.error_occurred.emit(str(e))
+        finally:
+            self.signals.finished.emit()
             
     def search_civitai(self):
         """Search CivitAI models"""
-        url = "https://civitai.com/api/v1/models"
-        params = {
-            "query": self.query,
-            "limit": 20,
-            "sort": "Most Downloaded"
-        }
-        
-        # Map model types to CivitAI types
-        type_mapping = {
-            "checkpoint_models": "Checkpoint",
-            "lora_models": "LORA",
-            "vae_models": "VAE",
-            "controlnet_models": "ControlNet",
-            "upscale_models": "Upscaler",
-            "workflows": "Workflows",
-            "text_encoder_models": "TextualInversion",
-            "diffusion_models": "Checkpoint"
-        }
-        
-        if self.model_type in type_mapping:
-            params["types"] = type_mapping[self.model_type]
-            
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        results = []
-        
-        for item in data.get("items", []):
-            # Get the latest version
-            versions = item.get("modelVersions", [])
-            if not versions:
-                continue
-                
-            latest_version = versions[0]
-            files = latest_version.get("files", [])
-            
-            # Find primary file or workflow file
-            primary_file = None
-            for file in files:
-                if file.get("primary", False):
-                    primary_file = file
-                    break
-            
-            # If no primary file, look for workflow files (.json)
-            if not primary_file and self.model_type == "workflows":
-                for file in files:
-                    if file.get("name", "").endswith(".json"):
-                        primary_file = file
-                        break
-            
-            if not primary_file:
-                continue
-                
-            download_url = primary_file.get("downloadUrl")
-            if not download_url:
-                continue
-                
-            results.append({
-                "title": item.get("name", "Unknown"),
-                "author": item.get("creator", {}).get("username", "Unknown"),
-                "description": self._truncate_text(item.get("description", ""), 200),
-                "download_url": download_url,
-                "rating": item.get("stats", {}).get("rating", 0),
-                "downloads": item.get("stats", {}).get("downloadCount", 0),
-                "type": item.get("type", "Unknown"),
-                "platform": "civitai",
-                "image_url": latest_version.get("images", [{}])[0].get("url") if latest_version.get("images") else None
-            })
-        
-        # Sort by download count (descending)
-        results.sort(key=lambda x: x.get('downloads', 0), reverse=True)
-        return results
+        return _cached_search("civitai", self.query, self.model_type, _do_civitai)
         
     def search_huggingface(self):
         """Search Hugging Face models"""
-        url = "https://huggingface.co/api/models"
-        params = {
-            "search": self.query,
-            "limit": 20,
-            "sort": "downloads",
-            "direction": -1
-        }
-        
-        # Map model types to HF tags
-        tag_mapping = {
-            "checkpoint_models": "diffusers",
-            "lora_models": "lora",
-            "controlnet_models": "controlnet",
-            "vae_models": "vae"
-        }
-        
-        if self.model_type in tag_mapping:
-            params["filter"] = tag_mapping[self.model_type]
-            
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        return _cached_search("huggingface", self.query, self.model_type, _do_hf)
+    
+    def search_all(self):
+        """Search all platforms concurrently and merge results by downloads"""
+        futures = [_EXECUTOR.submit(self.search_civitai), _EXECUTOR.submit(self.search_huggingface)]
         results = []
-        
-        for item in data:
-            # Construct download URL for git clone or direct file access
-            model_id = item.get("modelId", "")
-            if not model_id:
-                continue
-                
-            # For most models, we'll use the git clone URL
-            download_url = f"https://huggingface.co/{model_id}"
-            
-            results.append({
-                "title": model_id.split("/")[-1] if "/" in model_id else model_id,
-                "author": model_id.split("/")[0] if "/" in model_id else "Unknown",
-                "description": item.get("pipeline_tag", "") + " - " + ", ".join(item.get("tags", [])[:3]),
-                "download_url": download_url,
-                "downloads": item.get("downloads", 0),
-                "likes": item.get("likes", 0),
-                "type": item.get("pipeline_tag", "Unknown"),
-                "platform": "huggingface",
-                "last_modified": item.get("lastModified", "")
-            })
-        
-        # Sort by download count (descending)  
-        results.sort(key=lambda x: x.get('downloads', 0), reverse=True)
-        return results
-    
-    def _truncate_text(self, text, max_length):
-        """Truncate text with ellipsis if too long"""
-        if len(text) > max_length:
-            return text[:max_length] + "..."
-        return text
+        errors = []
+        for future in as_completed(futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                errors.append(e)
+        
+        # Only fail when no platform answered
+        if errors and not results:
+            raise errors[0]
+        for error in errors:
+            print(f"Search error: {error}")
+        
+        # Only the top results are shown; nlargest avoids sorting the rest
+        return heapq.nlargest(_MAX_RESULTS, results, key=itemgetter('downloads'))
+
+
+class _DescriptionLabel(QLabel):
+    """Word-wrapped label painted from a cached QTextDocument
+    
+    Documents are shared through doc_cache keyed by (text, width), so the
+    text is laid out once per width instead of on every paint.
+    """
+    
+    def __init__(self, doc_cache, parent=None):
+        super().__init__(parent)
+        self._doc_cache = doc_cache
+        self.setWordWrap(True)
+    
+    def _document(self, width):
+        key = (self.text(), width)
+        doc = self._doc_cache.get(key)
+        if doc is None:
+            doc = QTextDocument()
+            doc.setDocumentMargin(0)
+            doc.setDefaultFont(self.font())
+            doc.setTextWidth(width)
+            doc.setPlainText(self.text())
+            self._doc_cache[key] = doc
+        return doc
+    
+    def hasHeightForWidth(self):
+        return True
+    
+    def heightForWidth(self, width):
+        margins = self.contentsMargins()
+        doc = self._document(width - margins.left() - margins.right())
+        return math.ceil(doc.size().height()) + margins.top() + margins.bottom()
+    
+    def paintEvent(self, event):
+        # Keep the frame and background drawn by the style
+        QFrame.paintEvent(self, event)
+        
+        rect = self.contentsRect()
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.Text, self.palette().color(QPalette.WindowText))
+        painter = QPainter(self)
+        painter.translate(rect.topLeft())
+        self._document(rect.width()).documentLayout().draw(painter, context)
 
 
 class ModelSearchDialog(QWidget):
@@ -176,9 +465,17 @@ class ModelSearchDialog(QWidget):
     model_selected = Signal(str, str)  # url, platform
     
     def __init__(self, parent=None):
-        super().__init__(parent)
+        # A top-level window even when it has a parent
+        super().__init__(parent, Qt.Window)
         self.setWindowTitle("Search Models")
         self.setFixedSize(800, 600)
+        self._widget_pool = []  # result frames, reused across searches
+        self.search_worker = None
+        self._active_workers = set()  # kept alive until their run ends
+        self._nam = QNetworkAccessManager(self)  # shared by thumbnail downloads
+        self._thumb_replies = set()  # thumbnail downloads still in flight
+        QThreadPool.globalInstance().start(_prune_image_cache)
+        self._doc_cache = {}  # (description, width) -> QTextDocument
         self.setup_ui()
         
     def setup_ui(self):
@@ -206,7 +503,7 @@ class ModelSearchDialog(QWidget):
         
         # Platform selection
         self.platform_combo = QComboBox()
-        self.platform_combo.addItems(["CivitAI", "Hugging Face"])
+        self.platform_combo.addItems(["CivitAI", "Hugging Face", "Both"])
         search_layout.addWidget(QLabel("Platform:"))
         search_layout.addWidget(self.platform_combo)
         
@@ -227,6 +524,13 @@ class ModelSearchDialog(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Enter search terms...")
         self.search_input.returnPressed.connect(self.search_models)
+        self.search_input.textChanged.connect(self._schedule_search)
+        
+        # Typing searches after a pause; Enter and the button search at once
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(300)
+        self._debounce.timeout.connect(self._run_search)
         
         self.search_btn = QPushButton("Search")
         self.search_btn.clicked.connect(self.search_models)
@@ -240,15 +544,32 @@ class ModelSearchDialog(QWidget):
         self.results_scroll = QScrollArea()
         self.results_widget = QWidget()
         self.results_layout = QVBoxLayout(self.results_widget)
+        self.no_results_label = QLabel()
+        self.no_results_label.hide()
+        self.results_layout.addWidget(self.no_results_label)
+        self.results_layout.addStretch()
         self.results_scroll.setWidget(self.results_widget)
         self.results_scroll.setWidgetResizable(True)
         parent_layout.addWidget(self.results_scroll)
         
+    def _schedule_search(self):
+        """Search once the user pauses typing"""
+        self._debounce.start()
+    
     def search_models(self):
-        """Start a model search"""
+        """Start a model search right away"""
+        self._debounce.stop()
+        self._run_search(show_hint=True)
+    
+    def _run_search(self, show_hint=False):
+        """Start a model search for the current query if it is long enough"""
         query = self.search_input.text().strip()
         if not query:
             return
+        if len(query) < _MIN_QUERY_LENGTH:
+            if show_hint:
+                self._show_message(f"Type at least {_MIN_QUERY_LENGTH} characters")
+            return
             
         platform = self.platform_combo.currentText().lower().replace(" ", "")
         model_type = self._get_model_type()
@@ -261,86 +582,183 @@ class ModelSearchDialog(QWidget):
         self.progress_bar.setRange(0, 0)  # Indeterminate
         self.search_btn.setEnabled(False)
         
-        # Start search worker
-        self.search_worker = SearchWorker(platform, query, model_type)
-        self.search_worker.results_ready.connect(self.display_results)
-        self.search_worker.error_occurred.connect(self.handle_error)
-        self.search_worker.start()
+        # Supersede a search that is still running
+        self._cancel_search()
         
+        # Start search worker
+        worker = SearchWorker(platform, query, model_type)
+        worker.signals.results_ready.connect(self.display_results)
+        worker.signals.error_occurred.connect(self.handle_error)
+        worker.signals.finished.connect(partial(self._active_workers.discard, worker))
+        self._active_workers.add(worker)
+        self.search_worker = worker
+        QThreadPool.globalInstance().start(worker)
+        
+    def _cancel_search(self):
+        """Stop the running search from delivering its results"""
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+    
+    def _is_stale(self):
+        """Check whether the signal being handled came from a superseded search"""
+        sender = self.sender()
+        return (isinstance(sender, SearchWorker._Signals)
+                and (self.search_worker is None or sender is not self.search_worker.signals))
+    
     def _get_model_type(self):
         """Map UI model type selection to internal type"""
-        type_text = self.type_combo.currentText()
-        type_mapping = {
-            "Checkpoints": "checkpoint_models",
-            "LoRA": "lora_models",
-            "VAE": "vae_models",
-            "ControlNet": "controlnet_models",
-            "Upscale Models": "upscale_models",
-            "Workflows": "workflows",
-            "Text Encoders": "text_encoder_models",
-            "Diffusion Models": "diffusion_models"
-        }
-        return type_mapping.get(type_text, "")
+        return _UI_TYPE_MAP.get(self.type_combo.currentText(), "")
     
     def _clear_results(self):
-        """Clear previous search results"""
-        for i in reversed(range(self.results_layout.count())):
-            self.results_layout.itemAt(i).widget().setParent(None)
+        """Clear previous search results, keeping their frames for reuse"""
+        self.no_results_label.hide()
+        for frame in self._widget_pool:
+            frame.hide()
+        
+        # Thumbnails of hidden results are no longer needed
+        for reply in list(self._thumb_replies):
+            reply.abort()
+        
+    def _show_message(self, text):
+        """Show a message in place of the results"""
+        self._clear_results()
+        self.no_results_label.setText(text)
+        self.no_results_label.show()
         
     def display_results(self, results):
         """Display search results in the UI"""
+        if self._is_stale():
+            return
         self.progress_bar.setVisible(False)
         self.search_btn.setEnabled(True)
         
         if not results:
-            label = QLabel("No results found.")
-            self.results_layout.addWidget(label)
+            self._show_message("No results found.")
             return
             
-        for result in results:
-            result_widget = self._create_result_widget(result)
-            self.results_layout.addWidget(result_widget)
+        # Only keep laid out descriptions for the results on screen
+        self._doc_cache.clear()
+        
+        # Freeze painting and layout so all results cost one layout pass
+        self.results_widget.setUpdatesEnabled(False)
+        self.results_layout.setEnabled(False)
+        while len(self._widget_pool) < len(results):
+            frame = self._make_empty_result_widget()
+            # Keep the trailing stretch last
+            self.results_layout.insertWidget(self.results_layout.count() - 1, frame)
+            self._widget_pool.append(frame)
+        for frame, result in zip(self._widget_pool, results):
+            self._fill_result_widget(frame, result)
+            frame.show()
+        self.results_layout.setEnabled(True)
+        self.results_widget.setUpdatesEnabled(True)
             
-    def _create_result_widget(self, result):
-        """Create a widget for displaying a single search result"""
+    def _make_empty_result_widget(self):
+        """Create a result frame whose labels are filled in per search"""
         frame = QFrame()
         frame.setFrameStyle(QFrame.Box)
-        frame.setStyleSheet("QFrame { border: 1px solid #ccc; margin: 2px; padding: 4px; }")
+        frame.setProperty("role", "result")
+        frame.hide()
         
-        layout = QVBoxLayout(frame)
+        frame_layout = QHBoxLayout(frame)
         
-        # Title and author
-        title_layout = QHBoxLayout()
-        title_label = QLabel(f"<b>{result['title']}</b>")
-        author_label = QLabel(f"by {result['author']}")
-        author_label.setStyleSheet("color: #666;")
+        # Thumbnail, loaded asynchronously
+        frame._thumb = QLabel()
+        frame._thumb.setFixedSize(_THUMBNAIL_SIZE, _THUMBNAIL_SIZE)
+        frame._thumb.setAlignment(Qt.AlignCenter)
+        frame._thumb_url = None
+        frame_layout.addWidget(frame._thumb)
         
-        title_layout.addWidget(title_label)
-        title_layout.addWidget(author_label)
-        title_layout.addStretch()
+        layout = QVBoxLayout()
+        frame_layout.addLayout(layout)
         
-        # Stats
-        stats_text = self._format_stats(result)
-        stats_label = QLabel(stats_text)
-        stats_label.setStyleSheet("color: #666; font-size: 10px;")
-        title_layout.addWidget(stats_label)
-        
-        layout.addLayout(title_layout)
+        # Title, author and stats in one rich text label
+        frame._header = QLabel()
+        frame._header.setTextFormat(Qt.RichText)
+        layout.addWidget(frame._header)
         
         # Description
-        if result['description']:
-            desc_label = QLabel(result['description'])
-            desc_label.setWordWrap(True)
-            desc_label.setStyleSheet("color: #333; font-size: 11px;")
-            layout.addWidget(desc_label)
+        frame._desc = _DescriptionLabel(self._doc_cache)
+        frame._desc.setProperty("role", "description")
+        layout.addWidget(frame._desc)
             
-        # Add button
-        add_btn = QPushButton("Add to Script")
-        add_btn.clicked.connect(lambda: self.model_selected.emit(result['download_url'], result['platform']))
-        layout.addWidget(add_btn)
+        # Add button, wired once; it reads the frame's current result
+        frame._result = None
+        frame._add_btn = QPushButton("Add to Script")
+        frame._add_btn.clicked.connect(partial(self._emit_model_selected, frame))
+        layout.addWidget(frame._add_btn)
         
         return frame
     
+    def _fill_result_widget(self, frame, result):
+        """Show a search result in a pooled frame"""
+        frame._result = result
+        frame._header.setText(''.join([
+            '<b>', html.escape(result['title']), '</b> ',
+            '<span style="color:#666">by ', html.escape(result['author']), '</span> ',
+            '<span style="color:#666; font-size:10px">', self._format_stats(result), '</span>'
+        ]))
+        self._load_thumbnail(result.get('image_url'), frame)
+        frame._desc.setText(result['description'])
+        frame._desc.setVisible(bool(result['description']))
+    
+    def _load_thumbnail(self, url, frame):
+        """Show a result thumbnail from the disk cache or download it"""
+        frame._thumb_url = url
+        frame._thumb.clear()
+        frame._thumb.setVisible(bool(url))
+        if not url:
+            return
+        
+        path = _IMAGE_CACHE_DIR / hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+        try:
+            # A cache hit; refreshing its mtime keeps it through the next prune
+            os.utime(path)
+        except OSError:
+            pass
+        else:
+            self._set_thumbnail(frame, QPixmap(str(path)))
+            return
+        
+        request = QNetworkRequest(QUrl(url))
+        request.setTransferTimeout(10000)
+        reply = self._nam.get(request)
+        self._thumb_replies.add(reply)
+        reply.finished.connect(partial(self._on_thumbnail_finished, reply, url, path, frame))
+    
+    def _on_thumbnail_finished(self, reply, url, path, frame):
+        """Cache a downloaded thumbnail and show it if its frame still wants it"""
+        self._thumb_replies.discard(reply)
+        reply.deleteLater()
+        if reply.error() != QNetworkReply.NoError:
+            return
+        
+        data = bytes(reply.readAll())
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        except OSError as e:
+            print(f"Error caching thumbnail: {e}")
+        
+        # The pooled frame may show a different result by now
+        if frame._thumb_url == url:
+            self._set_thumbnail(frame, pixmap)
+    
+    def _set_thumbnail(self, frame, pixmap):
+        """Scale a pixmap into a frame's thumbnail label"""
+        if not pixmap.isNull():
+            frame._thumb.setPixmap(pixmap.scaled(
+                _THUMBNAIL_SIZE, _THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation
+            ))
+    
+    def _emit_model_selected(self, frame):
+        """Emit model_selected for the result currently shown in frame"""
+        result = frame._result
+        self.model_selected.emit(result['download_url'], result['platform'])
+    
     def _format_stats(self, result):
         """Format stats text based on platform"""
         if result['platform'] == 'civitai':
@@ -350,6 +768,8 @@ class ModelSearchDialog(QWidget):
         
     def handle_error(self, error_msg):
         """Handle search errors"""
+        if self._is_stale():
+            return
         self.progress_bar.setVisible(False)
         self.search_btn.setEnabled(True)
         
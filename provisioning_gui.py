@@ -17,28 +17,179 @@ Usage:
 
 Database:
     model_database.json - Persistent global model database
+    metadata_cache.json - Cached model names fetched from CivitAI
     presets.json - Saved preset configurations
 """
 
 import sys
 import os
 import subprocess
+import threading
 from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QListWidget, QPushButton, QTextEdit, QLabel, QFileDialog, QMessageBox, 
-    QSplitter, QGroupBox, QStackedWidget, QListWidgetItem, QMenu, QInputDialog,
+    QListView, QPushButton, QPlainTextEdit, QLabel, QFileDialog, QMessageBox, 
+    QSplitter, QGroupBox, QStackedWidget, QMenu, QInputDialog,
     QProgressDialog
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import (
+    Qt, Signal, QObject, QTimer, QProcess, QThreadPool, QRunnable,
+    QAbstractListModel, QModelIndex
+)
+from PySide6.QtGui import QFontDatabase
 
 # Import our modular components
-from model_search import ModelSearchDialog
+from model_search import ModelSearchDialog, warm_up_session
 from data_manager import DataManager
 from script_utils import ScriptGenerator, ScriptParser
 from category_panels import CategoryPanelManager
 
 
+# Application-wide stylesheet; widgets opt in through their "role" property
+# so Qt parses the rules once instead of once per styled widget
+APP_STYLESHEET = """
+QLabel[role="heading"] { font-weight: bold; font-size: 14px; padding: 5px; }
+QLabel[role="title"] { font-weight: bold; font-size: 16px; margin-bottom: 5px; }
+QLabel[role="instructions"] { font-size: 12px; color: #666; margin-bottom: 10px; }
+QLabel[role="hint"] { color: gray; font-size: 10px; }
+QFrame[role="result"], QFrame[role="result"] QLabel { border: 1px solid #ccc; margin: 2px; padding: 4px; }
+QLabel[role="description"] { color: #333; font-size: 11px; }
+"""
+
+
+# Bytes of git output kept for error reports
+GIT_OUTPUT_TAIL = 4096
+
+# Category list entries as (display name, data key), in list order
+CATEGORIES = (
+    ("⚙️ Settings", "settings"),
+    ("📦 APT Packages", "apt_packages"),
+    ("📦 PIP Packages", "pip_packages"),
+    ("🔧 ComfyUI Nodes", "nodes"),
+    ("🔧 Workflows", "workflows"),
+    ("🎯 Checkpoints", "checkpoint_models"),
+    ("🎯 UNET Models", "unet_models"),
+    ("🎯 Diffusion Models", "diffusion_models"),
+    ("🎨 LoRA Models", "lora_models"),
+    ("🎨 VAE Models", "vae_models"),
+    ("🎨 ControlNet", "controlnet_models"),
+    ("⬆️ ESRGAN Models", "esrgan_models"),
+    ("⬆️ Upscale Models", "upscale_models"),
+    ("🔍 Annotators", "annotator_models"),
+    ("🔍 CLIP Vision", "clip_vision_models"),
+    ("🔍 Text Encoders", "text_encoder_models"),
+)
+
+
+class CategoryListModel(QAbstractListModel):
+    """Read-only list model over (display name, data key) rows"""
+    
+    def __init__(self, rows, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        display_name, key = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return display_name
+        if role == Qt.UserRole:
+            return key
+        return None
+
+
+class RefreshWorker(QRunnable):
+    """Refetches model names on the shared Qt thread pool
+    
+    Names are only fetched here; they are handed to the GUI thread through
+    name_ready so the database is never written from this thread.
+    """
+    
+    class _Signals(QObject):
+        name_ready = Signal(str, str, str)  # category, url, name
+        progress = Signal(int, int)  # done, total
+        error_occurred = Signal(str)
+        finished = Signal(int, int)  # done, total, always emitted last
+    
+    def __init__(self, data_manager):
+        super().__init__()
+        self.signals = self._Signals()
+        self.data_manager = data_manager
+        self.total, self.to_fetch = data_manager.names_to_refresh()
+        self._cancelled = threading.Event()
+    
+    def cancel(self):
+        """Stop after the fetch in progress; queued fetches are dropped"""
+        self._cancelled.set()
+    
+    def run(self):
+        # Items that keep their name count as done right away
+        done = self.total - len(self.to_fetch)
+        try:
+            self.signals.progress.emit(done, self.total)
+            names = self.data_manager.iter_refreshed_names(self.to_fetch)
+            try:
+                for key, url, name in names:
+                    if self._cancelled.is_set():
+                        break
+                    if name and name != url:
+                        self.signals.name_ready.emit(key, url, name)
+                    done += 1
+                    self.signals.progress.emit(done, self.total)
+            finally:
+                names.close()
+        except Exception as e:
+            self.signals.error_occurred.emit(str(e))
+        finally:
+            # The GUI closes its progress dialog on this, however the run ended
+            self.signals.finished.emit(done, self.total)
+
+
+# Directories known to be inside a git work tree; only positive results are
+# kept, so a later git init or clone is picked up on the next check
+_git_repo_dirs = set()
+
+
+def _is_git_repo(path):
+    """Check whether path is inside a git work tree, starting git once per directory"""
+    if path in _git_repo_dirs:
+        return True
+    # A .git directory settles it without starting git, which is only
+    # asked for subdirectories
+    if (Path(path) / '.git').is_dir():
+        found = True
+    else:
+        try:
+            found = subprocess.run(
+                ['git', '-C', path, 'rev-parse', '--is-inside-work-tree'],
+                capture_output=True, timeout=2).returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            found = False
+    if found:
+        _git_repo_dirs.add(path)
+    return found
+
+
+def _write_executable(path, data):
+    """Write bytes to path as an executable file through a single descriptor"""
+    data = memoryview(data)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+        # The mode passed to os.open only applies to newly created files
+        os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
+
+
 class ProvisioningGUI(QMainWindow):
     """Main GUI application for provisioning script generation"""
     
@@ -50,13 +201,59 @@ class ProvisioningGUI(QMainWindow):
         # Initialize modular components
         self.data_manager = DataManager()
         self.script_generator = ScriptGenerator()
+        # (data revision, script text, UTF-8 bytes or None) of the last generated script
+        self._script_cache = (None, "", None)
         self.script_parser = ScriptParser()
         
+        # Regenerate the preview once per burst of changes
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(120)
+        self._preview_timer.timeout.connect(self._do_update_preview)
+        # Set when an update was skipped because the preview was hidden
+        self._preview_dirty = False
+        # Text the preview currently displays
+        self._preview_shown = None
+        
+        # Git commands for an upload run one after another off the UI thread
+        self._git_proc = QProcess(self)
+        self._git_proc.setProcessChannelMode(QProcess.MergedChannels)
+        self._git_proc.readyReadStandardOutput.connect(self._on_git_output)
+        self._git_proc.finished.connect(self._on_git_step_done)
+        self._git_proc.errorOccurred.connect(self._on_git_error)
+        self._git_steps = []
+        self._git_step = None
+        # Last GIT_OUTPUT_TAIL bytes of the running command's output
+        self._git_output = bytearray()
+        
         self.setup_ui()
+        self._setup_status_bar()
         self._load_initial_data()
         
+        # Get search ready once the window is up rather than on first click
+        self.search_dialog = None
+        QTimer.singleShot(0, self._prepare_search)
+        
+    def _setup_status_bar(self):
+        """Create the status bar with its undo button for Clear All"""
+        self._undo_btn = QPushButton("↩️ Undo")
+        self._undo_btn.setToolTip("Check the models again that Clear All unchecked")
+        self._undo_btn.clicked.connect(self._undo_clear_all)
+        self._undo_btn.hide()
+        self.statusBar().addPermanentWidget(self._undo_btn)
+        
+        # Selections cleared by the last Clear All, while it can still be undone
+        self._cleared_selections = None
+        self._undo_timer = QTimer(self)
+        self._undo_timer.setSingleShot(True)
+        self._undo_timer.setInterval(5000)
+        self._undo_timer.timeout.connect(self._forget_cleared_selections)
+        
     def setup_ui(self):
         """Set up the main user interface"""
+        # Build the whole widget tree before any layout pass or repaint
+        self.setUpdatesEnabled(False)
+        
         # Central widget
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -80,8 +277,11 @@ class ProvisioningGUI(QMainWindow):
         self._create_preview_panel(splitter)
         
         splitter.setSizes([180, 500, 400])
+        splitter.splitterMoved.connect(self._on_splitter_moved)
         main_layout.addWidget(splitter)
         
+        self.setUpdatesEnabled(True)
+        
     def _create_header(self, parent_layout):
         """Create the header with title and control buttons"""
         header_layout = QHBoxLayout()
@@ -101,6 +301,10 @@ class ProvisioningGUI(QMainWindow):
         self.upload_btn.setToolTip("Save script as default.sh and commit to git")
         self.upload_btn.clicked.connect(self.upload_to_git)
         
+        self.export_btn = QPushButton("📤 Export Database")
+        self.export_btn.setToolTip("Save a human-readable copy of the model database")
+        self.export_btn.clicked.connect(self.export_database)
+        
         # Clear all button
         self.clear_btn = QPushButton("🗑️ Clear All")
         self.clear_btn.setToolTip("Uncheck all models in the database")
@@ -114,6 +318,7 @@ class ProvisioningGUI(QMainWindow):
         header_layout.addWidget(self.load_btn)
         header_layout.addWidget(self.save_btn)
         header_layout.addWidget(self.upload_btn)
+        header_layout.addWidget(self.export_btn)
         header_layout.addWidget(self.clear_btn)
         header_layout.addWidget(self.refresh_btn)
         
@@ -126,16 +331,18 @@ class ProvisioningGUI(QMainWindow):
         left_layout.setContentsMargins(5, 5, 5, 5)
         
         categories_label = QLabel("Categories")
-        categories_label.setStyleSheet("font-weight: bold; font-size: 14px; padding: 5px;")
+        categories_label.setProperty("role", "heading")
         left_layout.addWidget(categories_label)
         
-        self.category_list = QListWidget()
+        self.category_list = QListView()
         self.category_list.setMaximumWidth(200)
         self.category_list.setMinimumWidth(150)
+        # All rows are single-line text, so Qt can size them from the first
+        self.category_list.setUniformItemSizes(True)
         
         # Populate category list
         self._populate_category_list()
-        self.category_list.currentItemChanged.connect(self._on_category_changed)
+        self.category_list.selectionModel().currentChanged.connect(self._on_category_changed)
         
         left_layout.addWidget(self.category_list)
         parent_splitter.addWidget(left_panel)
@@ -152,7 +359,7 @@ class ProvisioningGUI(QMainWindow):
         
         # Initialize category panel manager
         self.category_manager = CategoryPanelManager(self.stacked_widget, self.data_manager)
-        self.category_manager.create_all_panels()
+        self.category_manager.register_all_panels()
         
         # Connect signals
         self.category_manager.search_requested.connect(self._open_search_dialog)
@@ -164,102 +371,132 @@ class ProvisioningGUI(QMainWindow):
         """Create the right panel with script preview"""
         preview_group = QGroupBox("Preview")
         preview_layout = QVBoxLayout(preview_group)
-        self.preview_text = QTextEdit()
+        self.preview_text = QPlainTextEdit()
         self.preview_text.setReadOnly(True)
         self.preview_text.setMinimumWidth(400)
+        self.preview_text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
         preview_layout.addWidget(self.preview_text)
         
         parent_splitter.addWidget(preview_group)
         
     def _populate_category_list(self):
         """Populate the category list with all available categories"""
-        categories = [
-            ("⚙️ Settings", "settings"),
-            ("📦 APT Packages", "apt_packages"),
-            ("📦 PIP Packages", "pip_packages"),
-            ("🔧 ComfyUI Nodes", "nodes"),
-            ("🔧 Workflows", "workflows"),
-            ("🎯 Checkpoints", "checkpoint_models"),
-            ("🎯 UNET Models", "unet_models"),
-            ("🎯 Diffusion Models", "diffusion_models"),
-            ("🎨 LoRA Models", "lora_models"),
-            ("🎨 VAE Models", "vae_models"),
-            ("🎨 ControlNet", "controlnet_models"),
-            ("⬆️ ESRGAN Models", "esrgan_models"),
-            ("⬆️ Upscale Models", "upscale_models"),
-            ("🔍 Annotators", "annotator_models"),
-            ("🔍 CLIP Vision", "clip_vision_models"),
-            ("🔍 Text Encoders", "text_encoder_models"),
-        ]
-        
-        for display_name, key in categories:
-            self.category_list.addItem(display_name)
-            self.category_list.item(self.category_list.count() - 1).setData(Qt.UserRole, key)
-        
-        # Select first item by default
-        if self.category_list.count() > 0:
-            self.category_list.setCurrentRow(0)
+        self.category_list.setModel(CategoryListModel(CATEGORIES, self.category_list))
+        
+        # Select first item by default; the settings page is already current
+        # and change notifications are connected afterwards
+        self.category_list.setCurrentIndex(self.category_list.model().index(0))
             
-    def _on_category_changed(self, current, previous):
+    def _on_category_changed(self, current, previous=QModelIndex()):
         """Handle category selection change"""
-        if not current:
-            return
-            
-        key = current.data(Qt.UserRole)
-        if not key:
-            return
-            
-        # Get index mapping from category manager
-        index_map = self.category_manager.get_category_index_map()
-        
-        if key in index_map:
-            self.stacked_widget.setCurrentIndex(index_map[key])
+        if current.isValid():
+            index = self.category_manager.ensure_built(current.data(Qt.UserRole))
+            if index >= 0:
+                self.stacked_widget.setCurrentIndex(index)
     
+    def showEvent(self, event):
+        """Catch up on preview updates skipped while the window was hidden"""
+        super().showEvent(event)
+        if self._preview_dirty:
+            self._update_preview()
+    
+    def _on_splitter_moved(self, pos, index):
+        """Catch up on preview updates skipped while the preview was collapsed"""
+        if self._preview_dirty:
+            self._update_preview()
+    
+    def closeEvent(self, event):
+        """Flush pending database writes before the window closes"""
+        self.category_manager.shutdown()
+        super().closeEvent(event)
+
     def _load_initial_data(self):
         """Load initial data and update UI"""
         self.data_manager.load_database()
         self.category_manager.refresh_ui_from_data()
         self._update_preview()
     
+    def _prepare_search(self):
+        """Build the search dialog and warm its HTTP session and git probe
+        in the background"""
+        QThreadPool.globalInstance().start(warm_up_session)
+        cwd = os.getcwd()
+        QThreadPool.globalInstance().start(lambda: _is_git_repo(cwd))
+        self._get_search_dialog()
+    
+    def _get_search_dialog(self):
+        """Get the persistent search dialog, creating it on first use"""
+        if self.search_dialog is None:
+            # Owned by the main window, so it closes and is freed along with it
+            self.search_dialog = ModelSearchDialog(self)
+            self.search_dialog.model_selected.connect(self._on_search_model_selected)
+        return self.search_dialog
+    
     def _open_search_dialog(self, model_type):
         """Open the model search dialog"""
-        if not hasattr(self, 'search_dialog') or not self.search_dialog:
-            self.search_dialog = ModelSearchDialog()
-            self.search_dialog.model_selected.connect(
-                lambda url, platform: self._add_model_from_search(model_type, url, platform)
-            )
-            
+        self._get_search_dialog()
         self.current_model_type = model_type
         self.search_dialog.show()
         self.search_dialog.raise_()
         self.search_dialog.activateWindow()
         
+    def _on_search_model_selected(self, url, platform):
+        """Add a model picked in the search dialog to the category it was opened for"""
+        self._add_model_from_search(self.current_model_type, url, platform)
+    
     def _add_model_from_search(self, model_type, url, platform):
         """Add a model URL from search results"""
         success = self.category_manager.add_model_from_search(model_type, url)
         
+        # A status message keeps adding several results in a row non-modal
         if success:
-            QMessageBox.information(
-                self,
-                "Model Added",
-                f"Model URL added to {model_type.replace('_', ' ').title()}"
-            )
+            self.statusBar().showMessage(
+                f"Model URL added to {model_type.replace('_', ' ').title()}", 3000)
         else:
-            QMessageBox.warning(
-                self,
-                "Model Exists",
-                "This model already exists in the database."
-            )
+            self.statusBar().showMessage("This model already exists in the database.", 3000)
+    
+    def _get_script(self):
+        """Get the generated script, reusing it while the data and template are unchanged"""
+        self.script_generator.load_template()
+        rev = (self.data_manager.revision, self.script_generator.template_version)
+        if self._script_cache[0] == rev:
+            return self._script_cache[1]
+        revisions = {key: self.data_manager.category_revision(key)
+                     for key in self.script_generator.ARRAY_KEYS}
+        script = self.script_generator.generate_script(self.data_manager.data, revisions)
+        self._script_cache = (rev, script, None)
+        return script
+    
+    def _get_script_bytes(self):
+        """Get the generated script encoded for writing, encoding once per revision"""
+        script = self._get_script()
+        rev, _, data = self._script_cache
+        if data is None:
+            data = script.encode('utf-8')
+            self._script_cache = (rev, script, data)
+        return data
     
     def _update_preview(self):
+        """Schedule a debounced script preview update"""
+        self._preview_timer.start()
+    
+    def _do_update_preview(self):
         """Update the script preview"""
         if not hasattr(self, 'preview_text'):
             return
+        # Hidden, or collapsed by the splitter; regenerate when shown again
+        if self.preview_text.visibleRegion().isEmpty():
+            self._preview_dirty = True
+            return
+        self._preview_dirty = False
         try:
-            script = self.script_generator.generate_script(self.data_manager.data)
-            self.preview_text.setPlainText(script)
+            script = self._get_script()
         except FileNotFoundError as e:
-            self.preview_text.setPlainText(f"Error: {e}")
+            script = f"Error: {e}"
+        # Relaying out the whole document is far dearer than comparing text
+        if script != self._preview_shown:
+            self.preview_text.setPlainText(script)
+            self._preview_shown = script
     
     def load_script(self):
         """Load a provisioning script preset"""
@@ -271,12 +508,10 @@ class ProvisioningGUI(QMainWindow):
         )
         
         if filename:
-            with open(filename, 'r') as f:
-                content = f.read()
-                self.script_parser.parse_script(content, self.data_manager)
-                self.category_manager.refresh_ui_from_data()
-                self._update_preview()
-                self.data_manager.save_database()
+            with open(filename, 'r') as f, self.data_manager.batch():
+                self.script_parser.parse_script_iter(f, self.data_manager)
+            self._update_preview()
+            self.category_manager.schedule_save()
     
     def save_script(self):
         """Save the generated script preset"""
@@ -292,39 +527,60 @@ class ProvisioningGUI(QMainWindow):
                 # Force sync UI state to database before generating script
                 self.category_manager.sync_ui_to_database()
                 
-                script = self.script_generator.generate_script(self.data_manager.data)
-                with open(filename, 'w') as f:
-                    f.write(script)
-                
-                # Make executable
-                os.chmod(filename, 0o755)
+                _write_executable(filename, self._get_script_bytes())
                 
                 QMessageBox.information(self, "Success", f"Preset saved to {filename}")
             except FileNotFoundError as e:
                 QMessageBox.critical(self, "Error", str(e))
     
-    def clear_all_selections(self):
-        """Clear all selections in the database"""
-        reply = QMessageBox.question(
+    def export_database(self):
+        """Export the model database as indented JSON"""
+        filename, _ = QFileDialog.getSaveFileName(
             self,
-            "Clear All Selections",
-            "This will uncheck all models in the database. Continue?",
-            QMessageBox.Yes | QMessageBox.No
+            "Export Database",
+            "model_database.json",
+            "JSON Files (*.json);;All Files (*)"
         )
         
-        if reply == QMessageBox.Yes:
-            self.data_manager.clear_all_selections()
-            self.category_manager.refresh_ui_from_data()
+        if filename:
+            try:
+                self.category_manager.sync_ui_to_database()
+                self.data_manager.export_database(filename)
+                QMessageBox.information(self, "Success", f"Database exported to {filename}")
+            except OSError as e:
+                QMessageBox.critical(self, "Error", str(e))
+    
+    def clear_all_selections(self):
+        """Clear all selections in the database, offering a short-lived undo"""
+        self._cleared_selections = self.data_manager.clear_all_selections()
+        self.category_manager.refresh_check_states()
+        self._update_preview()
+        self.category_manager.schedule_save()
+        
+        self.statusBar().showMessage("Cleared all selections", self._undo_timer.interval())
+        self._undo_btn.show()
+        self._undo_timer.start()
+    
+    def _undo_clear_all(self):
+        """Restore the selections removed by the last Clear All"""
+        if self._cleared_selections:
+            self.data_manager.restore_selections(self._cleared_selections)
+            self.category_manager.refresh_check_states()
             self._update_preview()
-            self.data_manager.save_database()
+            self.category_manager.schedule_save()
+            self.statusBar().showMessage("Selections restored", 3000)
+        self._forget_cleared_selections()
     
+    def _forget_cleared_selections(self):
+        """Drop the undo state of the last Clear All"""
+        self._undo_timer.stop()
+        self._cleared_selections = None
+        self._undo_btn.hide()
     
     def upload_to_git(self):
         """Save and commit all changes to git"""
         # Check if we're in a git repository
-        try:
-            subprocess.run(['git', 'status'], capture_output=True, check=True)
-        except subprocess.CalledProcessError:
+        if not _is_git_repo(os.getcwd()):
             QMessageBox.critical(self, "Error", "Not in a git repository!")
             return
             
@@ -344,41 +600,85 @@ class ProvisioningGUI(QMainWindow):
             self.category_manager.sync_ui_to_database()
             
             # Save the script to default.sh
-            script = self.script_generator.generate_script(self.data_manager.data)
-            with open('default.sh', 'w') as f:
-                f.write(script)
-            os.chmod('default.sh', 0o755)
-            
-            # Git add all changes
-            subprocess.run(['git', 'add', '.'], check=True)
+            _write_executable('default.sh', self._get_script_bytes())
             
-            # Git commit
-            subprocess.run(['git', 'commit', '-m', commit_message.strip()], check=True)
-            
-            # Git push
-            result = subprocess.run(['git', 'push'], capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                QMessageBox.information(
-                    self, 
-                    "Success", 
-                    "Changes committed and pushed successfully!"
-                )
-            else:
+            # Git add, commit and push without blocking the event loop
+            self._start_git_steps([
+                ['git', 'add', '.'],
+                ['git', 'commit', '-m', commit_message.strip()],
+                ['git', 'push'],
+            ])
+        except FileNotFoundError as e:
+            QMessageBox.critical(self, "Error", str(e))
+    
+    def _start_git_steps(self, steps):
+        """Run git commands in sequence, disabling uploads meanwhile"""
+        self._git_steps = list(steps)
+        self.upload_btn.setEnabled(False)
+        self.upload_btn.setText("⏳ Uploading...")
+        self._run_next_git_step()
+    
+    def _run_next_git_step(self):
+        """Start the next queued git command"""
+        self._git_step = self._git_steps.pop(0)
+        self._git_output.clear()
+        self.statusBar().showMessage(f"Running {' '.join(self._git_step[:2])}...")
+        self._git_proc.start(self._git_step[0], self._git_step[1:])
+    
+    def _on_git_step_done(self, exit_code, exit_status):
+        """Continue the git chain or report how it ended"""
+        if exit_status != QProcess.NormalExit or exit_code != 0:
+            error = self._git_output.decode(errors='replace').strip()
+            if self._git_step[1] == 'push':
                 QMessageBox.warning(
                     self,
                     "Push Failed",
-                    f"Commit successful but push failed:\n{result.stderr}\n\nYou can push manually later."
+                    f"Commit successful but push failed:\n{error}\n\nYou can push manually later."
                 )
-                
-        except subprocess.CalledProcessError as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Git operation failed: {str(e)}"
-            )
-        except FileNotFoundError as e:
-            QMessageBox.critical(self, "Error", str(e))
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Error",
+                    f"Git operation failed: {' '.join(self._git_step)}\n{error}"
+                )
+            self._finish_git_steps()
+            return
+        
+        if self._git_steps:
+            self._run_next_git_step()
+            return
+        
+        self._finish_git_steps()
+        QMessageBox.information(
+            self, 
+            "Success", 
+            "Changes committed and pushed successfully!"
+        )
+    
+    def _on_git_output(self):
+        """Keep the tail of git's output and show its latest line"""
+        self._git_output += bytes(self._git_proc.readAllStandardOutput())
+        del self._git_output[:-GIT_OUTPUT_TAIL]
+        # Progress lines are redrawn with carriage returns
+        lines = self._git_output.decode(errors='replace').replace('\r', '\n').split('\n')
+        latest = next((line.strip() for line in reversed(lines) if line.strip()), None)
+        if latest:
+            self.statusBar().showMessage(latest)
+    
+    def _on_git_error(self, error):
+        """Report a git command that could not be started"""
+        # Other errors are followed by finished() and handled there
+        if error == QProcess.FailedToStart:
+            self._finish_git_steps()
+            QMessageBox.critical(self, "Error", f"Could not run git: {self._git_proc.errorString()}")
+    
+    def _finish_git_steps(self):
+        """Re-enable uploads after the git chain stops"""
+        self._git_steps = []
+        self._git_step = None
+        self.statusBar().clearMessage()
+        self.upload_btn.setText("🚀 Upload to Git")
+        self.upload_btn.setEnabled(True)
     
     def refresh_model_names(self):
         """Refresh model names from CivitAI and Hugging Face"""
@@ -394,59 +694,73 @@ class ProvisioningGUI(QMainWindow):
         if reply != QMessageBox.Yes:
             return
         
+        # Fetch on the thread pool; progress and names arrive as queued signals
+        worker = RefreshWorker(self.data_manager)
+        worker.signals.name_ready.connect(self._on_refreshed_name)
+        worker.signals.progress.connect(self._on_refresh_progress)
+        worker.signals.error_occurred.connect(self._on_refresh_error)
+        worker.signals.finished.connect(self._on_refresh_finished)
+        self._refresh_error = None
+        
         # Create progress dialog
         progress = QProgressDialog("Refreshing model names...", "Cancel", 0, 100, self)
         progress.setWindowModality(Qt.WindowModal)
         progress.setWindowTitle("Refreshing")
+        self._refresh_progress = progress
+        progress.canceled.connect(worker.cancel)
+        self._refresh_worker = worker
         progress.show()
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_refreshed_name(self, key, url, name):
+        """Store a refetched model name"""
+        self.data_manager.set_item_name(key, url, name)
+    
+    def _on_refresh_progress(self, current, total):
+        """Show name refresh progress"""
+        if total and not self._refresh_progress.wasCanceled():
+            self._refresh_progress.setValue(int((current / total) * 100))
+            self._refresh_progress.setLabelText(f"Refreshing model names... ({current}/{total})")
+    
+    def _on_refresh_error(self, message):
+        """Remember why a name refresh failed, reported once it has finished"""
+        self._refresh_error = message
+    
+    def _on_refresh_finished(self, refreshed, total):
+        """Show the refreshed names and report how the refresh ended"""
+        self._refresh_progress.close()
+        self._refresh_progress = None
+        self._refresh_worker = None
+        
+        # The lists pick up the new names themselves; persist them
+        self.category_manager.schedule_save()
+        self._update_preview()
         
-        # Define progress callback
-        def update_progress(current, total):
-            if progress.wasCanceled():
-                return False
-            progress.setValue(int((current / total) * 100))
-            progress.setLabelText(f"Refreshing model names... ({current}/{total})")
-            QApplication.processEvents()
-            return True
-        
-        try:
-            # Refresh model names
-            refreshed, total = self.data_manager.refresh_all_model_names(
-                progress_callback=lambda c, t: update_progress(c, t) if not progress.wasCanceled() else False
-            )
-            
-            progress.close()
-            
-            if refreshed == total:
-                # Refresh the UI to show new names
-                self.category_manager.refresh_ui_from_data()
-                
-                QMessageBox.information(
-                    self,
-                    "Refresh Complete",
-                    f"Successfully refreshed {refreshed} model names!"
-                )
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Refresh Cancelled",
-                    f"Refresh cancelled. Updated {refreshed} out of {total} models."
-                )
-                
-        except Exception as e:
-            progress.close()
+        if self._refresh_error is not None:
             QMessageBox.critical(
                 self,
                 "Error",
-                f"Error refreshing model names: {str(e)}"
+                f"Error refreshing model names: {self._refresh_error}"
+            )
+        elif refreshed == total:
+            QMessageBox.information(
+                self,
+                "Refresh Complete",
+                f"Successfully refreshed {refreshed} model names!"
+            )
+        else:
+            QMessageBox.warning(
+                self,
+                "Refresh Cancelled",
+                f"Refresh cancelled. Updated {refreshed} out of {total} models."
             )
-
 
 def main():
     app = QApplication(sys.argv)
     
     # Set application style
     app.setStyle('Fusion')
+    app.setStyleSheet(APP_STYLESHEET)
     
     window = ProvisioningGUI()
     window.show()
@@ -5,95 +5,127 @@ Script Utilities Module
 Handles script generation and parsing functionality.
 """
 
+import os
 import re
+import time
+from types import MappingProxyType
 from data_manager import fetch_model_metadata
 
 
 class ScriptGenerator:
     """Handles generation of provisioning scripts from data"""
     
+    # Database categories, each filling the template placeholder of that name
+    ARRAY_KEYS = (
+        'apt_packages', 'pip_packages', 'nodes', 'workflows',
+        'checkpoint_models', 'unet_models', 'lora_models', 'vae_models',
+        'esrgan_models', 'upscale_models', 'controlnet_models',
+        'annotator_models', 'clip_vision_models', 'text_encoder_models',
+        'diffusion_models'
+    )
+    # Any template placeholder, e.g. {nodes} or {max_parallel_downloads}
+    _PLACEHOLDER_RE = re.compile(
+        r'\{(' + '|'.join(ARRAY_KEYS + ('max_parallel_downloads',)) + r')\}'
+    )
+    
+    # Seconds between checks of the template file for changes
+    TEMPLATE_CHECK_INTERVAL = 1.0
+    
     def __init__(self, template_file='template.sh'):
         self.template_file = template_file
+        self._template = None
+        self._template_mtime = None
+        self._template_checked = 0.0
+        # Bumped whenever a changed template is read
+        self.template_version = 0
+        # key -> (category revision, formatted array) from the last generation
+        self._array_cache = {}
     
-    def generate_script(self, data):
-        """Generate a script from the data"""
-        # Load template from file
+    def load_template(self):
+        """Get the template text, reading the file again only after it changed"""
+        now = time.monotonic()
+        if self._template is not None and now - self._template_checked < self.TEMPLATE_CHECK_INTERVAL:
+            return self._template
+        
         try:
-            with open(self.template_file, 'r') as f:
-                template = f.read()
+            mtime = os.stat(self.template_file).st_mtime_ns
+            if self._template is None or mtime != self._template_mtime:
+                with open(self.template_file, 'r') as f:
+                    self._template = f.read()
+                self._template_mtime = mtime
+                self.template_version += 1
         except FileNotFoundError:
+            self._template = None
             raise FileNotFoundError(f"Template file '{self.template_file}' not found!")
         
-        # Format the arrays - only include checked items with comments for model names
-        def format_array(items):
-            if not items:
-                return ""
-            # Filter to only checked items
-            checked_items = [item for item in items if item.get('checked', True)]
-            if not checked_items:
-                return ""
-            
-            lines = []
-            for item in checked_items:
-                url = item['url']
-                name = item.get('name')
-                if name and name != url:
-                    # Add model name as comment
-                    lines.append(f'    "{url}" # {name}')
-                else:
-                    lines.append(f'    "{url}"')
-            return '\n'.join(lines)
+        self._template_checked = now
+        return self._template
+    
+    @staticmethod
+    def format_array(items):
+        """Format the checked items of a category as bash array lines"""
+        if not items:
+            return ""
+        # Categories are {url: item} dicts in the database
+        if isinstance(items, dict):
+            items = items.values()
         
-        # Replace placeholders using string replacement
-        replacements = {
-            '{apt_packages}': format_array(data.get('apt_packages', [])),
-            '{pip_packages}': format_array(data.get('pip_packages', [])),
-            '{nodes}': format_array(data.get('nodes', [])),
-            '{workflows}': format_array(data.get('workflows', [])),
-            '{checkpoint_models}': format_array(data.get('checkpoint_models', [])),
-            '{unet_models}': format_array(data.get('unet_models', [])),
-            '{lora_models}': format_array(data.get('lora_models', [])),
-            '{vae_models}': format_array(data.get('vae_models', [])),
-            '{esrgan_models}': format_array(data.get('esrgan_models', [])),
-            '{upscale_models}': format_array(data.get('upscale_models', [])),
-            '{controlnet_models}': format_array(data.get('controlnet_models', [])),
-            '{annotator_models}': format_array(data.get('annotator_models', [])),
-            '{clip_vision_models}': format_array(data.get('clip_vision_models', [])),
-            '{text_encoder_models}': format_array(data.get('text_encoder_models', [])),
-            '{diffusion_models}': format_array(data.get('diffusion_models', [])),
-            '{max_parallel_downloads}': str(data.get('max_parallel_downloads', 4))
-        }
+        # Only include checked items, with comments for model names
+        lines = []
+        for item in items:
+            if not item.get('checked', True):
+                continue
+            url = item['url']
+            name = item.get('name')
+            if name and name != url:
+                # Add model name as comment
+                lines.append(f'    "{url}" # {name}')
+            else:
+                lines.append(f'    "{url}"')
+        return '\n'.join(lines)
+    
+    def generate_script(self, data, revisions=None):
+        """Generate a script from the data
         
-        # Apply replacements
-        formatted_script = template
-        for placeholder, value in replacements.items():
-            formatted_script = formatted_script.replace(placeholder, value)
+        Args:
+            data: Database dict with the categories and settings
+            revisions: Optional {category: revision} dict; categories whose
+                revision is unchanged since the last call are not formatted again
+        """
+        template = self.load_template()
+        
+        # Replace all placeholders in a single pass over the template
+        if revisions is None:
+            self._array_cache.clear()
+            replacements = {key: self.format_array(data.get(key)) for key in self.ARRAY_KEYS}
+        else:
+            replacements = {key: self._format_cached(key, data.get(key), revisions.get(key))
+                            for key in self.ARRAY_KEYS}
+        replacements['max_parallel_downloads'] = str(data.get('max_parallel_downloads', 4))
         
-        return formatted_script
+        return self._PLACEHOLDER_RE.sub(lambda match: replacements[match.group(1)], template)
+    
+    def _format_cached(self, key, items, revision):
+        """Format a category, reusing the last result while its revision is unchanged"""
+        cached = self._array_cache.get(key)
+        if cached is not None and revision is not None and cached[0] == revision:
+            return cached[1]
+        text = self.format_array(items)
+        self._array_cache[key] = (revision, text)
+        return text
 
 
 class ScriptParser:
     """Handles parsing of provisioning scripts"""
     
-    def __init__(self):
-        # Define patterns for each array
-        self.patterns = {
-            'apt_packages': r'APT_PACKAGES=\((.*?)\)',
-            'pip_packages': r'PIP_PACKAGES=\((.*?)\)',
-            'nodes': r'NODES=\((.*?)\)',
-            'workflows': r'WORKFLOWS=\((.*?)\)',
-            'checkpoint_models': r'CHECKPOINT_MODELS=\((.*?)\)',
-            'unet_models': r'UNET_MODELS=\((.*?)\)',
-            'lora_models': r'LORA_MODELS=\((.*?)\)',
-            'vae_models': r'VAE_MODELS=\((.*?)\)',
-            'esrgan_models': r'ESRGAN_MODELS=\((.*?)\)',
-            'upscale_models': r'UPSCALE_MODELS=\((.*?)\)',
-            'controlnet_models': r'CONTROLNET_MODELS=\((.*?)\)',
-            'annotator_models': r'ANNOTATOR_MODELS=\((.*?)\)',
-            'clip_vision_models': r'CLIP_VISION_MODELS=\((.*?)\)',
-            'text_encoder_models': r'TEXT_ENCODER_MODELS=\((.*?)\)',
-            'diffusion_models': r'DIFFUSION_MODELS=\((.*?)\)'
-        }
+    # Opening line of a bash array, e.g. NODES=(
+    _ARRAY_START_RE = re.compile(r'([A-Z_]+)=\((.*)$')
+    # One array entry: a quoted URL with an optional trailing comment
+    _ENTRY_RE = re.compile(r'"([^"]+)"(?:\s*#\s*(.*))?')
+    _MAX_PARALLEL_RE = re.compile(r'MAX_PARALLEL_DOWNLOADS=(\d+)')
+    
+    # Map each script array name to its database category, e.g. NODES -> nodes
+    arrays = MappingProxyType({key.upper(): key for key in ScriptGenerator.ARRAY_KEYS})
     
     def parse_script(self, content, data_manager):
         """
@@ -103,67 +135,90 @@ class ScriptParser:
             content: Script content to parse
             data_manager: DataManager instance to update
         """
+        self.parse_script_iter(content.splitlines(), data_manager)
+    
+    def parse_script_iter(self, lines, data_manager):
+        """
+        Parse a bash script given as an iterable of lines, such as an open file
+        
+        Args:
+            lines: Script lines to parse
+            data_manager: DataManager instance to update
+        """
+        arrays, max_parallel = self._read_script(lines)
+        
         # Don't clear existing data - just uncheck everything first
         data_manager.clear_all_selections()
         
-        # Extract items from each array and mark them as checked
-        for key, pattern in self.patterns.items():
-            urls = self._extract_urls_from_array(content, pattern)
-            
+        # Mark the items of each array as checked
+        for key, urls in arrays.items():
             for url, comment in urls:
                 # Check if URL exists in database
-                existing_items = data_manager.get_all_items(key)
-                existing_item = None
-                for item in existing_items:
-                    if item['url'] == url:
-                        existing_item = item
-                        break
+                existing_item = data_manager.get_item(key, url)
                 
                 if existing_item:
                     # Mark existing item as checked
                     data_manager.update_item_checked_state(key, url, True)
                     # Update name if we have a comment and no name stored
                     if comment and not existing_item.get('name'):
-                        existing_item['name'] = comment
+                        data_manager.set_item_name(key, url, comment)
                 else:
-                    # Add new item to database
-                    data_manager.add_item(key, url, checked=True)
-                    # If we have a comment, update the name
-                    if comment:
-                        items = data_manager.get_all_items(key)
-                        for item in items:
-                            if item['url'] == url:
-                                item['name'] = comment
-                                break
+                    # Add new item to database, naming it from the comment or a
+                    # cached lookup; anything else is named later off the UI thread
+                    name = comment or data_manager.metadata_cache.get(url)
+                    data_manager.add_item(key, url, checked=True, name=name)
         
-        # Parse MAX_PARALLEL_DOWNLOADS setting
-        max_parallel_match = re.search(r'MAX_PARALLEL_DOWNLOADS=(\d+)', content)
-        if max_parallel_match:
-            try:
-                max_parallel_value = int(max_parallel_match.group(1))
-                data_manager.update_max_parallel_downloads(max_parallel_value)
-            except ValueError:
-                # If parsing fails, keep default value
-                pass
+        # Apply MAX_PARALLEL_DOWNLOADS setting
+        if max_parallel is not None:
+            data_manager.update_max_parallel_downloads(max_parallel)
     
-    def _extract_urls_from_array(self, content, pattern):
-        """Extract URLs and comments from a script array"""
-        match = re.search(pattern, content, re.DOTALL)
-        if not match:
-            return []
+    def _read_script(self, lines):
+        """Collect (url, comment) pairs per category and the parallel setting
         
-        array_content = match.group(1)
-        lines = array_content.strip().split('\n')
-        urls = []
+        Only the first definition of each array counts. An array ends at a
+        line starting with ')', so parentheses inside comments are kept.
+        """
+        arrays = {}
+        current = None
+        max_parallel = None
         
         for line in lines:
             line = line.strip()
-            if line and line.startswith('"'):
-                # Extract URL and optional comment
-                url_match = re.match(r'"([^"]+)"(?:\s*#\s*(.*))?', line)
-                if url_match:
-                    url = url_match.group(1)
-                    comment = url_match.group(2).strip() if url_match.group(2) else None
-                    urls.append((url, comment))
+            if current is not None:
+                if line.startswith(')'):
+                    current = None
+                else:
+                    self._read_entry(line, current)
+                continue
+            
+            if max_parallel is None:
+                max_parallel_match = self._MAX_PARALLEL_RE.search(line)
+                if max_parallel_match:
+                    max_parallel = int(max_parallel_match.group(1))
+            
+            start_match = self._ARRAY_START_RE.match(line)
+            if not start_match:
+                continue
+            key = self.arrays.get(start_match.group(1))
+            if key is None or key in arrays:
+                continue
+            
+            arrays[key] = current = []
+            rest = start_match.group(2).strip()
+            # Single-line array such as NODES=() or NODES=("url")
+            if rest.endswith(')'):
+                self._read_entry(rest[:-1].strip(), current)
+                current = None
+            else:
+                self._read_entry(rest, current)
         
-        return urls
\ No newline at end of file
+        return arrays, max_parallel
+    
+    def _read_entry(self, line, urls):
+        """Append the URL and optional comment of an array line to urls"""
+        if line.startswith('"'):
+            url_match = self._ENTRY_RE.match(line)
+            if url_match:
+                url = url_match.group(1)
+                comment = url_match.group(2).strip() if url_match.group(2) else None
+                urls.append((url, comment))